@@ -0,0 +1,136 @@
+import operator
+from typing import Iterable, NamedTuple
+
+from measurements import WeatherReading
+
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class AlertRule(NamedTuple):
+    """
+    A declarative alert condition: `field op threshold`.
+    """
+    name: str
+    field: str
+    op: str
+    threshold: float
+    message: str
+
+
+DEFAULT_RULES = (
+    AlertRule("HEAT", "temperature", ">", 30, "HEAT WARNING: Temperature above 30°C"),
+    AlertRule("FROST", "temperature", "<", 0, "FROST WARNING: Temperature below 0°C"),
+    AlertRule("HIGH_HUMIDITY", "humidity", ">", 90, "HIGH HUMIDITY WARNING: Humidity above 90%"),
+    AlertRule("LOW_HUMIDITY", "humidity", "<", 20, "LOW HUMIDITY WARNING: Very dry conditions"),
+    AlertRule("STORM", "pressure", "<", 970, "STORM WARNING: Low pressure system"),
+    AlertRule("HIGH_PRESSURE", "pressure", ">", 1040, "HIGH PRESSURE: Stable weather system"),
+)
+
+
+class AlertMatches(NamedTuple):
+    """
+    The alerts raised by a batch: one entry per (reading, rule) match,
+    ordered by reading index and then by rule index.
+    """
+    indices: "np.ndarray"
+    rule_ids: "np.ndarray"
+    types: "np.ndarray"
+
+
+class RuleTable:
+    """
+    A table of alert rules that can be checked one reading at a time or
+    evaluated with NumPy over a whole batch of readings.
+
+    For the batch path, rules are grouped by field and operator and their
+    thresholds sorted, so each reading needs one binary search per group
+    rather than one comparison per rule. NumPy is only needed by evaluate().
+    """
+    def __init__(self, rules: Iterable[AlertRule] = DEFAULT_RULES):
+        self._rules = tuple(rules)
+        for rule in self._rules:
+            if rule.field not in WeatherReading._fields:
+                raise ValueError(f"Unknown field {rule.field!r} in rule {rule.name}")
+            if rule.op not in _OPERATORS:
+                raise ValueError(f"Unknown operator {rule.op!r} in rule {rule.name}")
+        self._checks = [
+            (index, rule.field, _OPERATORS[rule.op], rule.threshold)
+            for index, rule in enumerate(self._rules)
+        ]
+        self._groups = None
+        self._types = None
+
+    @property
+    def rules(self):
+        """Get the rules of the table, in rule index order."""
+        return self._rules
+
+    def __len__(self):
+        return len(self._rules)
+
+    def check(self, reading):
+        """
+        Get the rules that fire for a single reading.
+        """
+        return [
+            self._rules[index]
+            for index, field, compare, threshold in self._checks
+            if compare(getattr(reading, field), threshold)
+        ]
+
+    def _compile(self):
+        import numpy as np
+        groups = {}
+        for index, rule in enumerate(self._rules):
+            groups.setdefault((rule.field, rule.op), []).append(index)
+        self._groups = []
+        for (field, op), rule_ids in groups.items():
+            rule_ids = np.asarray(rule_ids, dtype=np.intp)
+            thresholds = np.asarray([self._rules[i].threshold for i in rule_ids], dtype=np.float64)
+            order = np.argsort(thresholds, kind="stable")
+            self._groups.append((field, op, thresholds[order], rule_ids[order]))
+        self._types = np.asarray([rule.name for rule in self._rules], dtype=object)
+
+    def evaluate(self, batch) -> AlertMatches:
+        """
+        Evaluate every rule over every reading of a MeasurementBatch.
+        """
+        import numpy as np
+        if self._groups is None:
+            self._compile()
+        all_indices = [np.empty(0, dtype=np.intp)]
+        all_rule_ids = [np.empty(0, dtype=np.intp)]
+        for field, op, thresholds, rule_ids in self._groups:
+            values = np.asarray(getattr(batch, field), dtype=np.float64)
+            # Sorted thresholds put the matching rules of a reading in a
+            # contiguous run: a prefix for > and >=, a suffix for < and <=
+            if op == ">":
+                counts = np.searchsorted(thresholds, values, side="left")
+            elif op == ">=":
+                counts = np.searchsorted(thresholds, values, side="right")
+            elif op == "<":
+                counts = len(thresholds) - np.searchsorted(thresholds, values, side="right")
+            else:
+                counts = len(thresholds) - np.searchsorted(thresholds, values, side="left")
+            counts[np.isnan(values)] = 0
+            total = int(counts.sum())
+            if not total:
+                continue
+            indices = np.repeat(np.arange(len(values)), counts)
+            ends = np.cumsum(counts)
+            positions = np.arange(total) - np.repeat(ends - counts, counts)
+            if op in ("<", "<="):
+                positions += np.repeat(len(thresholds) - counts, counts)
+            all_indices.append(indices)
+            all_rule_ids.append(rule_ids[positions])
+        indices = np.concatenate(all_indices)
+        rule_ids = np.concatenate(all_rule_ids)
+        order = np.lexsort((rule_ids, indices))
+        indices, rule_ids = indices[order], rule_ids[order]
+        return AlertMatches(indices, rule_ids, self._types[rule_ids])
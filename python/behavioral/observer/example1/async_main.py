@@ -0,0 +1,50 @@
+"""
+Asynchronous Observer Pattern Example
+
+Each observer of the AsyncWeatherStation drains its own bounded queue in a
+separate task, so a slow observer does not hold back the station or the
+other observers. What happens when a queue fills up is decided per observer
+by its overflow policy.
+"""
+import asyncio
+
+from async_weather_station import AsyncWeatherStation, OverflowPolicy
+from observer_pattern import AsyncObserver
+
+
+class AsyncWeatherDisplay(AsyncObserver):
+    """
+    Display that takes a while to redraw itself.
+    """
+    def __init__(self, name, redraw_seconds):
+        self.name = name
+        self.redraw_seconds = redraw_seconds
+
+    async def update(self, subject):
+        await asyncio.sleep(self.redraw_seconds)
+        print(f"{self.name} Display: {subject.temperature}°C, "
+              f"{subject.humidity}%, {subject.pressure} hPa")
+
+
+async def run_async_weather_example():
+    """
+    Demonstrates the Observer pattern with asyncio and bounded queues.
+    """
+    weather_station = AsyncWeatherStation(maxsize=2)
+
+    fast_display = AsyncWeatherDisplay("Fast", 0)
+    slow_display = AsyncWeatherDisplay("Slow", 0.05)
+    weather_station.attach(fast_display)
+    weather_station.attach(slow_display, policy=OverflowPolicy.COALESCE_LATEST)
+
+    print("--- Publishing 5 measurements ---")
+    for temperature in range(20, 25):
+        await weather_station.set_measurements(temperature, 60, 1013)
+
+    await weather_station.join()
+    print(f"\nSlow display skipped {weather_station.dropped(slow_display)} readings")
+    await weather_station.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_async_weather_example())
@@ -0,0 +1,233 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Dict
+
+from measurements import WeatherReading
+from observer_pattern import AsyncSubject, AsyncObserver
+
+
+class OverflowPolicy(Enum):
+    """
+    What an observer queue does when a reading arrives while it is full.
+    """
+    BLOCK = "block"                      # the producer waits for free space
+    DROP_OLDEST = "drop-oldest"          # the oldest queued reading is discarded
+    COALESCE_LATEST = "coalesce-latest"  # the newest queued reading is replaced
+
+
+class ObserverQueue:
+    """
+    A bounded queue of readings drained by a single observer.
+    """
+    def __init__(self, maxsize: int = 64, policy=OverflowPolicy.BLOCK):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._items = deque()
+        self._maxsize = maxsize
+        self._policy = OverflowPolicy(policy)
+        self._changed = asyncio.Condition()
+        self._unfinished = 0
+        self._closed = False
+        self._waker = None
+        self.dropped = 0
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        """Get the overflow policy of the queue."""
+        return self._policy
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        """Get whether the queue has been closed."""
+        return self._closed
+
+    def close(self):
+        """
+        Close the queue: producers blocked in put() or join() return, and
+        readings put afterwards are discarded. Must be called from the
+        event loop.
+        """
+        if not self._closed:
+            self._closed = True
+            self._waker = asyncio.get_running_loop().create_task(self._wake_all())
+
+    async def _wake_all(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def put(self, reading: WeatherReading):
+        """
+        Queue a reading, applying the overflow policy if the queue is full.
+        Returns without queueing it once the queue is closed.
+        """
+        async with self._changed:
+            if self._closed:
+                return
+            if len(self._items) >= self._maxsize:
+                if self._policy is OverflowPolicy.BLOCK:
+                    await self._changed.wait_for(lambda: self._closed or len(self._items) < self._maxsize)
+                    if self._closed:
+                        return
+                elif self._policy is OverflowPolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self._unfinished -= 1
+                    self.dropped += 1
+                else:
+                    self._items[-1] = reading
+                    self.dropped += 1
+                    return
+            self._items.append(reading)
+            self._unfinished += 1
+            self._changed.notify_all()
+
+    async def get(self) -> WeatherReading:
+        """
+        Wait for and remove the oldest queued reading.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._items)
+            reading = self._items.popleft()
+            self._changed.notify_all()
+            return reading
+
+    async def task_done(self):
+        """
+        Mark a reading returned by get() as fully processed.
+        """
+        async with self._changed:
+            self._unfinished -= 1
+            self._changed.notify_all()
+
+    async def join(self):
+        """
+        Wait until every queued reading has been processed, or the queue
+        is closed.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._closed or self._unfinished == 0)
+
+
+class AsyncWeatherStation(AsyncSubject):
+    """
+    A WeatherStation whose observers each drain their own bounded queue.
+
+    notify() only enqueues a snapshot of the current readings, so a slow
+    observer can hold back the producer only if its policy is BLOCK.
+    Observers receive the WeatherReading snapshot in place of the station.
+    """
+    def __init__(self, maxsize: int = 64, policy=OverflowPolicy.BLOCK):
+        self._queues: Dict[AsyncObserver, ObserverQueue] = {}
+        self._workers: Dict[AsyncObserver, asyncio.Task] = {}
+        self._maxsize = maxsize
+        self._policy = OverflowPolicy(policy)
+        self._temperature = 0
+        self._humidity = 0
+        self._pressure = 0
+
+    def attach(self, observer: AsyncObserver, maxsize: int = None, policy=None):
+        """
+        Attach an observer and start draining its queue.
+
+        Must be called from a running event loop. maxsize and policy default
+        to the values the station was created with.
+        """
+        if observer in self._queues:
+            return
+        queue = ObserverQueue(
+            maxsize if maxsize is not None else self._maxsize,
+            policy if policy is not None else self._policy,
+        )
+        self._queues[observer] = queue
+        self._workers[observer] = asyncio.get_running_loop().create_task(
+            self._drain(observer, queue)
+        )
+
+    def detach(self, observer):
+        """
+        Detach an observer, discarding any readings still queued for it.
+        A producer blocked on its queue is released.
+        """
+        queue = self._queues.pop(observer, None)
+        if queue is not None:
+            queue.close()
+            self._workers.pop(observer).cancel()
+
+    async def notify(self):
+        """
+        Queue the current readings for every observer.
+        """
+        reading = self.snapshot()
+        for queue in list(self._queues.values()):
+            await queue.put(reading)
+
+    async def set_measurements(self, temperature, humidity, pressure):
+        """
+        Set new weather measurements and queue them for observers.
+        """
+        self._temperature = temperature
+        self._humidity = humidity
+        self._pressure = pressure
+        await self.notify()
+
+    async def join(self):
+        """
+        Wait until every observer has processed its queued readings.
+        """
+        await asyncio.gather(*(queue.join() for queue in list(self._queues.values())))
+
+    async def aclose(self):
+        """
+        Stop all observer tasks without waiting for their queues to drain.
+        """
+        workers = list(self._workers.values())
+        for queue in self._queues.values():
+            queue.close()
+        self._queues.clear()
+        self._workers.clear()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def dropped(self, observer) -> int:
+        """
+        Get how many readings an observer's queue has dropped or coalesced.
+        """
+        return self._queues[observer].dropped
+
+    def snapshot(self) -> WeatherReading:
+        """Get an immutable copy of the current readings."""
+        return WeatherReading(self._temperature, self._humidity, self._pressure)
+
+    @staticmethod
+    async def _drain(observer: AsyncObserver, queue: ObserverQueue):
+        loop = asyncio.get_running_loop()
+        while True:
+            reading = await queue.get()
+            try:
+                await observer.update(reading)
+            except Exception as e:
+                loop.call_exception_handler({
+                    "message": f"Observer {observer!r} failed to process {reading}",
+                    "exception": e,
+                })
+            finally:
+                await queue.task_done()
+
+    @property
+    def temperature(self):
+        """Get the current temperature."""
+        return self._temperature
+
+    @property
+    def humidity(self):
+        """Get the current humidity."""
+        return self._humidity
+
+    @property
+    def pressure(self):
+        """Get the current pressure."""
+        return self._pressure
@@ -0,0 +1,86 @@
+"""
+Alert Rule Benchmark
+
+Compares checking alert rules one reading at a time, the way
+AlertSystem.update() does, with evaluating the whole RuleTable over a batch
+of readings with NumPy. Both paths must raise the same alerts.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from alert_rules import DEFAULT_RULES, AlertRule, RuleTable
+from measurements import MeasurementBatch
+
+
+def random_rules(count, seed):
+    """
+    Generate extra rules with random fields and operators. Like real alerts,
+    their thresholds sit in the outer tenth of each field's range.
+    """
+    rng = random.Random(seed)
+    ranges = {"temperature": (-20, 45), "humidity": (0, 100), "pressure": (950, 1060)}
+    rules = []
+    for i in range(count):
+        field = rng.choice(list(ranges))
+        op = rng.choice((">", ">=", "<", "<="))
+        low, high = ranges[field]
+        margin = (high - low) * rng.uniform(0, 0.1)
+        threshold = high - margin if op in (">", ">=") else low + margin
+        rules.append(AlertRule(f"RULE_{i}", field, op, threshold, f"{field} {op} {threshold:.1f}"))
+    return rules
+
+
+def random_batch(size, seed):
+    """
+    Generate a batch of plausible readings.
+    """
+    rng = np.random.default_rng(seed)
+    return MeasurementBatch(
+        rng.uniform(-20, 45, size),
+        rng.uniform(0, 100, size),
+        rng.uniform(950, 1060, size),
+    )
+
+
+def per_sample(table, batch):
+    """
+    Check every reading separately and collect (reading, rule) pairs.
+    """
+    rule_ids = {rule: index for index, rule in enumerate(table.rules)}
+    matches = []
+    for index, reading in enumerate(batch):
+        matches.extend((index, rule_ids[rule]) for rule in table.check(reading))
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readings", type=int, default=100_000)
+    parser.add_argument("--rules", type=int, nargs="+", default=[0, 100, 500])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    batch = random_batch(args.readings, args.seed)
+    for extra in args.rules:
+        table = RuleTable(DEFAULT_RULES + tuple(random_rules(extra, args.seed)))
+
+        start = time.perf_counter()
+        expected = per_sample(table, batch)
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matches = table.evaluate(batch)
+        vectorized = time.perf_counter() - start
+
+        actual = list(zip(matches.indices.tolist(), matches.rule_ids.tolist()))
+        assert actual == expected, "vectorized alerts differ from the per-sample path"
+        print(f"rules={len(table):<5} readings={len(batch):<8} matches={len(actual):<9} "
+              f"per-sample={scalar:8.3f} s  vectorized={vectorized:8.4f} s  "
+              f"speedup={scalar / vectorized:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Observer Fan-out Benchmark Suite
+
+Drives a WeatherStation with synthetic load and reports, for every
+combination of observer count and dispatch mode, how long attach and detach
+take, notify throughput, p50/p99 notify latency and peak traced memory.
+Results are written as one JSON object per line, so runs can be stored and
+compared to catch regressions in the observer subsystem.
+
+Example:
+    python bench_fanout.py --observers 1 1000 100000 --dispatch inline thread \\
+        --mix noop=0.9,light=0.09,heavy=0.01 --rate 500 --output results.jsonl
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from dispatchers import InlineDispatcher, ProcessPoolDispatcher, ThreadPoolDispatcher
+from observer_pattern import Observer
+from weather_station import WeatherStation
+
+
+class NoopObserver(Observer):
+    """Does nothing, so only the dispatch overhead is measured."""
+    def update(self, subject):
+        pass
+
+
+class LightObserver(Observer):
+    """Does a little arithmetic on every reading, like a display."""
+    def __init__(self):
+        self.total = 0.0
+
+    def update(self, subject):
+        self.total += subject.temperature * 0.5 + subject.humidity
+
+
+class HeavyObserver(Observer):
+    """Burns CPU on every reading, like an analytics job."""
+    def update(self, subject):
+        value = subject.pressure
+        for _ in range(2000):
+            value = (value * 1.0001) % 1013.25
+
+
+OBSERVER_TYPES = {
+    "noop": NoopObserver,
+    "light": LightObserver,
+    "heavy": HeavyObserver,
+}
+
+DISPATCHERS = {
+    "inline": InlineDispatcher,
+    "thread": ThreadPoolDispatcher,
+    "process": ProcessPoolDispatcher,
+}
+
+
+def parse_mix(text):
+    """
+    Parse an observer cost mix such as "noop=0.9,heavy=0.1".
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OBSERVER_TYPES:
+            raise argparse.ArgumentTypeError(f"unknown observer type {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def make_observers(count, mix, seed):
+    """
+    Create count observers whose types are drawn according to mix.
+    """
+    rng = random.Random(seed)
+    names = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    return [OBSERVER_TYPES[name]() for name in names]
+
+
+def percentile(sorted_values, fraction):
+    """Get a percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_case(observer_count, dispatch, mix, updates, rate, seed):
+    """
+    Run one configuration and return its timings.
+    """
+    observers = make_observers(observer_count, mix, seed)
+    dispatcher = DISPATCHERS[dispatch]()
+    station = WeatherStation(dispatcher)
+    rng = random.Random(seed)
+    readings = [
+        (rng.uniform(-10, 40), rng.uniform(10, 100), rng.uniform(960, 1050))
+        for _ in range(updates)
+    ]
+
+    start = time.perf_counter()
+    for observer in observers:
+        station.attach(observer)
+    attach_seconds = time.perf_counter() - start
+
+    latencies = []
+    interval = 1.0 / rate if rate else 0.0
+    start = time.perf_counter()
+    for index, reading in enumerate(readings):
+        if interval:
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        before = time.perf_counter()
+        station.set_measurements(*reading)
+        latencies.append(time.perf_counter() - before)
+    dispatcher.wait()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for observer in observers:
+        station.detach(observer)
+    detach_seconds = time.perf_counter() - start
+    dispatcher.close()
+
+    latencies.sort()
+    return {
+        "attach_seconds": attach_seconds,
+        "detach_seconds": detach_seconds,
+        "updates": updates,
+        "elapsed_seconds": elapsed,
+        "throughput_updates_per_second": updates / elapsed if elapsed else None,
+        "deliveries_per_second": updates * observer_count / elapsed if elapsed else None,
+        "notify_p50_seconds": percentile(latencies, 0.50),
+        "notify_p99_seconds": percentile(latencies, 0.99),
+        "notify_max_seconds": latencies[-1] if latencies else None,
+    }
+
+
+def measure_peak_memory(observer_count, dispatch, mix, updates, seed):
+    """
+    Repeat a configuration under tracemalloc and return its peak traced
+    memory. This runs separately because tracing distorts the timings.
+    """
+    tracemalloc.start()
+    try:
+        run_case(observer_count, dispatch, mix, updates, 0, seed)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("\n\n", 1)[1],
+    )
+    parser.add_argument("--observers", type=int, nargs="+", default=[1, 10, 100, 1000, 10_000, 100_000])
+    parser.add_argument("--dispatch", nargs="+", choices=list(DISPATCHERS), default=["inline", "thread"])
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("noop=0.9,light=0.1"),
+                        help="observer cost mix, e.g. noop=0.9,light=0.09,heavy=0.01")
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=0,
+                        help="target updates per second, 0 for as fast as possible")
+    parser.add_argument("--max-pool-observers", type=int, default=1000,
+                        help="skip thread/process runs with more observers than this; "
+                             "skipped runs are reported with \"skipped\": true")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for dispatch in args.dispatch:
+            for count in args.observers:
+                result = {
+                    "benchmark": "observer_fanout",
+                    "python": platform.python_version(),
+                    "dispatch": dispatch,
+                    "observers": count,
+                    "mix": args.mix,
+                    "rate": args.rate,
+                }
+                if dispatch != "inline" and count > args.max_pool_observers:
+                    result["skipped"] = True
+                    result["reason"] = f"more than --max-pool-observers={args.max_pool_observers}"
+                    output.write(json.dumps(result) + "\n")
+                    output.flush()
+                    continue
+                result.update(run_case(count, dispatch, args.mix, args.updates, args.rate, args.seed))
+                if not args.no_memory:
+                    result["peak_memory_bytes"] = measure_peak_memory(
+                        count, dispatch, args.mix, min(args.updates, 10), args.seed
+                    )
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
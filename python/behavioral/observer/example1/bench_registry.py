@@ -0,0 +1,89 @@
+"""
+Observer Registry Benchmark
+
+Measures attach, notify and detach on a WeatherStation holding many
+observers, with strong and weak observer references. Run with --baseline to
+compare against the list-based registry the station used to have; its
+detach is O(n), so keep the observer count modest in that case.
+"""
+import argparse
+import gc
+import time
+
+from observer_pattern import Observer
+from weather_station import WeatherStation
+
+
+class NullObserver(Observer):
+    """
+    Observer that does no work, so only the station's overhead is measured.
+    """
+    def update(self, subject):
+        pass
+
+
+class ListWeatherStation(WeatherStation):
+    """
+    WeatherStation with the original list-based attach and detach.
+    """
+    def __init__(self):
+        super().__init__()
+        self._observers = []
+
+    def attach(self, observer):
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def detach(self, observer):
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+
+def _timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def run_benchmark(name, station, count, notifications):
+    """
+    Time attaching, notifying and detaching count observers.
+    """
+    observers = [NullObserver() for _ in range(count)]
+
+    def attach_all():
+        for observer in observers:
+            station.attach(observer)
+
+    def notify_all():
+        for i in range(notifications):
+            station.set_measurements(i, 50, 1013)
+
+    def detach_all():
+        for observer in observers:
+            station.detach(observer)
+
+    gc.collect()
+    attach = _timed(attach_all)
+    notify = _timed(notify_all) / notifications
+    detach = _timed(detach_all)
+    print(f"{name:<10} n={count:<7} attach={attach * 1e3:9.2f} ms  "
+          f"notify={notify * 1e3:9.2f} ms  detach={detach * 1e3:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--observers", type=int, default=100_000)
+    parser.add_argument("--notifications", type=int, default=10)
+    parser.add_argument("--baseline", action="store_true",
+                        help="also run the list-based station")
+    args = parser.parse_args()
+
+    run_benchmark("strong", WeatherStation(), args.observers, args.notifications)
+    run_benchmark("weak", WeatherStation(weak_observers=True), args.observers, args.notifications)
+    if args.baseline:
+        run_benchmark("list", ListWeatherStation(), args.observers, args.notifications)
+
+
+if __name__ == "__main__":
+    main()
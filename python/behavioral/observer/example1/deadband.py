@@ -0,0 +1,84 @@
+from typing import Dict, NamedTuple, Optional
+
+from measurements import MeasurementDelta, WeatherReading
+
+
+FIELDS = WeatherReading._fields
+
+
+class Deadband(NamedTuple):
+    """
+    The band around a field's last delivered value inside which changes are
+    too small to report: the larger of an absolute amount and a fraction of
+    the last delivered value.
+    """
+    absolute: float = 0.0
+    relative: float = 0.0
+
+    def exceeded(self, reference, value) -> bool:
+        """Check whether value lies outside the band around reference."""
+        return abs(value - reference) > max(self.absolute, self.relative * abs(reference))
+
+
+# Fields without a deadband report any change at all
+_ANY_CHANGE = Deadband()
+
+
+class ChangeDetector:
+    """
+    Decides whether new readings differ meaningfully from the readings last
+    delivered to observers.
+
+    Each field is compared with the value it had when it last changed
+    meaningfully, so slow drift is reported once it adds up to more than
+    the deadband.
+    """
+    def __init__(self, reference: WeatherReading):
+        self._deadbands: Dict[str, Deadband] = {}
+        self._reference = reference
+
+    @property
+    def active(self) -> bool:
+        """Whether any field has a deadband."""
+        return bool(self._deadbands)
+
+    def set_deadband(self, field: str, absolute: float = 0.0, relative: float = 0.0):
+        """
+        Set the deadband of a field.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field {field!r}, expected one of {FIELDS}")
+        if absolute < 0 or relative < 0:
+            raise ValueError("Deadbands cannot be negative")
+        self._deadbands[field] = Deadband(absolute, relative)
+
+    def clear_deadband(self, field: str):
+        """
+        Remove the deadband of a field.
+        """
+        self._deadbands.pop(field, None)
+
+    def reset(self, reading: WeatherReading):
+        """
+        Treat a reading as delivered without comparing it.
+        """
+        self._reference = reading
+
+    def detect(self, reading: WeatherReading) -> Optional[MeasurementDelta]:
+        """
+        Compare a reading with the last delivered one. Returns the delta if
+        any field changed meaningfully, or None if the reading can be skipped.
+        """
+        reference = self._reference
+        changed = tuple(
+            field
+            for field, old, new in zip(FIELDS, reference, reading)
+            if self._deadbands.get(field, _ANY_CHANGE).exceeded(old, new)
+        )
+        if not changed:
+            return None
+        self._reference = WeatherReading(*(
+            new if field in changed else old
+            for field, old, new in zip(FIELDS, reference, reading)
+        ))
+        return MeasurementDelta(changed, reference, reading)
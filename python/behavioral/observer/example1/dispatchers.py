@@ -0,0 +1,258 @@
+import pickle
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from measurements import MeasurementBatch, MeasurementDelta, WeatherReading
+
+
+class Dispatcher(ABC):
+    """
+    A Dispatcher decides where observer updates run when a subject notifies.
+    Every dispatcher delivers the updates of a single observer in order.
+    """
+    @abstractmethod
+    def dispatch(self, observers, subject, delta: MeasurementDelta = None):
+        """
+        Deliver the subject's current state to every observer, through
+        update_delta() when the subject describes the change with a delta.
+        """
+        pass
+
+    @abstractmethod
+    def dispatch_batch(self, observers, subject, batch):
+        """
+        Deliver a batch of readings to every observer.
+        """
+        pass
+
+    def wait(self):
+        """
+        Block until every update dispatched so far has been delivered.
+        """
+        pass
+
+    def close(self):
+        """
+        Wait for pending updates and release the dispatcher's resources.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InlineDispatcher(Dispatcher):
+    """
+    Runs every update on the notifying thread, one observer after another.
+    """
+    def dispatch(self, observers, subject, delta: MeasurementDelta = None):
+        if delta is None:
+            for observer in observers:
+                observer.update(subject)
+        else:
+            for observer in observers:
+                observer.update_delta(subject, delta)
+
+    def dispatch_batch(self, observers, subject, batch):
+        for observer in observers:
+            observer.update_batch(subject, batch)
+
+
+def _run_calls(observer, calls):
+    """
+    Deliver queued (reading, delta, columns) calls to one observer in order.
+
+    Runs in the worker, so it only receives compact snapshots: a reading
+    tuple, plus the delta for update_delta() calls or the batch columns
+    for update_batch() calls.
+    Returns the exceptions raised by the observer.
+    """
+    errors = []
+    for reading, delta, columns in calls:
+        try:
+            if columns is not None:
+                observer.update_batch(WeatherReading(*reading), MeasurementBatch(*columns))
+            elif delta is not None:
+                observer.update_delta(WeatherReading(*reading), delta)
+            else:
+                observer.update(WeatherReading(*reading))
+        except Exception as e:
+            errors.append(e)
+    return errors
+
+
+class _ExecutorDispatcher(Dispatcher):
+    """
+    Base class for dispatchers that run updates on an Executor.
+
+    Each observer has a lane of pending calls. A lane is handed to the
+    executor only while it is idle, which keeps each observer's updates in
+    order while different observers run in parallel. Lanes are indexed by
+    identity, like ObserverRegistry, so observers that compare equal or are
+    unhashable each get their own.
+    """
+    def __init__(self, executor: Executor, owns_executor: bool):
+        self._executor = executor
+        self._owns_executor = owns_executor
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # id(observer) -> (observer, pending calls), while the lane is busy
+        self._lanes = {}
+        self._errors = []
+
+    def dispatch(self, observers, subject, delta: MeasurementDelta = None):
+        self._submit_all(observers, (tuple(subject.snapshot()), delta, None))
+
+    def dispatch_batch(self, observers, subject, batch):
+        columns = (batch.temperature, batch.humidity, batch.pressure)
+        self._submit_all(observers, (tuple(subject.snapshot()), None, columns))
+
+    def _submit_all(self, observers, call):
+        idle = []
+        with self._lock:
+            for observer in observers:
+                entry = self._lanes.get(id(observer))
+                if entry is None:
+                    self._lanes[id(observer)] = (observer, deque())
+                    idle.append(observer)
+                else:
+                    entry[1].append(call)
+        for observer in idle:
+            self._start(observer, [call])
+
+    def _next_calls(self, observer, errors):
+        """
+        Record finished work and take the lane's pending calls, if any.
+        """
+        with self._lock:
+            self._errors.extend(errors)
+            lane = self._lanes[id(observer)][1]
+            if not lane:
+                del self._lanes[id(observer)]
+                self._idle.notify_all()
+                return []
+            calls = list(lane)
+            lane.clear()
+            return calls
+
+    @abstractmethod
+    def _start(self, observer, calls):
+        pass
+
+    def wait(self):
+        """
+        Block until all dispatched updates have run, then re-raise the
+        first exception an observer raised since the last wait().
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._lanes)
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self._owns_executor:
+                self._executor.shutdown()
+
+
+class ThreadPoolDispatcher(_ExecutorDispatcher):
+    """
+    Runs updates on a thread pool. Observers receive a WeatherReading
+    snapshot instead of the subject, since the subject may change while
+    the update is still running.
+    """
+    def __init__(self, max_workers: int = None, executor: ThreadPoolExecutor = None):
+        if executor is None:
+            super().__init__(ThreadPoolExecutor(max_workers), owns_executor=True)
+        else:
+            super().__init__(executor, owns_executor=False)
+
+    def _start(self, observer, calls):
+        self._executor.submit(self._run_lane, observer, calls)
+
+    def _run_lane(self, observer, calls):
+        while calls:
+            calls = self._next_calls(observer, _run_calls(observer, calls))
+
+
+class ProcessPoolDispatcher(_ExecutorDispatcher):
+    """
+    Runs updates in worker processes so CPU-heavy observers use every core.
+
+    Observers must be picklable: they are pickled, with the batch columns,
+    for each submission, and only a compact reading tuple is sent in place
+    of the subject. Observers holding open files, locks or sockets (such as
+    WeatherLogger) cannot be used, and dispatch() raises TypeError for them
+    before anything is submitted. Changes an observer makes to its own
+    state stay in the worker process, so this mode suits observers whose
+    work ends in output or external storage.
+    """
+    def __init__(self, max_workers: int = None, executor: ProcessPoolExecutor = None):
+        if executor is None:
+            super().__init__(ProcessPoolExecutor(max_workers), owns_executor=True)
+        else:
+            super().__init__(executor, owns_executor=False)
+        # id(observer) -> weak reference, for observers already known to
+        # pickle, so each is only checked once
+        self._picklable = {}
+
+    def dispatch(self, observers, subject, delta: MeasurementDelta = None):
+        observers = self._check_picklable(observers)
+        super().dispatch(observers, subject, delta)
+
+    def dispatch_batch(self, observers, subject, batch):
+        observers = self._check_picklable(observers)
+        super().dispatch_batch(observers, subject, batch)
+
+    def _check_picklable(self, observers):
+        """
+        Fail before submitting anything if an observer cannot be pickled,
+        instead of in the executor's feeder thread.
+        """
+        observers = list(observers)
+        for observer in observers:
+            known = self._picklable.get(id(observer))
+            if known is not None and known() is observer:
+                continue
+            try:
+                pickle.dumps(observer)
+            except Exception as e:
+                raise TypeError(
+                    f"ProcessPoolDispatcher needs picklable observers, but "
+                    f"{type(observer).__name__} cannot be pickled: {e}"
+                ) from e
+            try:
+                self._picklable[id(observer)] = weakref.ref(observer, self._reaper(id(observer)))
+            except TypeError:
+                pass  # Not weakly referenceable: checked on every dispatch
+        return observers
+
+    def _reaper(self, key):
+        def reap(ref):
+            if self._picklable.get(key) is ref:
+                del self._picklable[key]
+        return reap
+
+    def _start(self, observer, calls):
+        future = self._executor.submit(_run_calls, observer, calls)
+        future.add_done_callback(lambda done: self._finished(observer, done))
+
+    def _finished(self, observer, future):
+        if future.cancelled():
+            errors = []
+        elif future.exception() is not None:
+            errors = [future.exception()]
+        else:
+            errors = future.result()
+        calls = self._next_calls(observer, errors)
+        if calls:
+            self._start(observer, calls)
@@ -9,13 +9,26 @@ Key components:
 - Observer: Interface that defines the update method for observers
 - ConcreteObserver: Implements the Observer interface to respond to updates
 """
+import os
+import tempfile
+
 from weather_station import WeatherStation
-from weather_observer import WeatherDisplay, AlertSystem, WeatherLogger
+from rolling_statistics import RollingStatistics, WindowSpec
+from weather_log import WeatherLogReader
+from weather_observer import WeatherDisplay, AlertSystem, WeatherLogger, ThresholdAlert
 
 def run_weather_example():
     """
     Demonstrates the Observer pattern using a weather station example.
     """
+    # Log to a fresh file, so every run starts from an empty log
+    with tempfile.TemporaryDirectory() as log_directory:
+        run_weather_station(os.path.join(log_directory, "weather.log"))
+
+def run_weather_station(log_path):
+    """
+    Drives a weather station whose logger writes to log_path.
+    """
     # Create the subject
     weather_station = WeatherStation()
     
@@ -23,14 +36,20 @@ def run_weather_example():
     phone_display = WeatherDisplay("Phone")
     web_display = WeatherDisplay("Web")
     alert_system = AlertSystem()
-    weather_logger = WeatherLogger()
+    weather_logger = WeatherLogger(log_path)
+    statistics = RollingStatistics({"last 3": WindowSpec(size=3), "1 hour": WindowSpec(seconds=3600)})
     
     # Register observers with the subject
     weather_station.attach(phone_display)
     weather_station.attach(web_display)
     weather_station.attach(alert_system)
     weather_station.attach(weather_logger)
+    weather_station.attach(statistics)
     
+    # Subscribe an alert that only hears about readings crossing its threshold
+    storm_alert = ThresholdAlert("Storm approaching")
+    weather_station.subscribe(storm_alert, "pressure", high=1008)
+
     print("Weather station is operational with all observers attached.")
     
     # Change measurements and trigger notifications
@@ -53,6 +72,21 @@ def run_weather_example():
     print("\n--- Setting measurements: -2°C, 30%, 1020 hPa ---")
     weather_station.set_measurements(-2, 30, 1020)
 
+    # Deliver several readings with a single notification
+    print("\n--- Setting a batch of 3 measurements ---")
+    weather_station.set_measurements_batch([18, 19, 21], [55, 50, 45], [1012, 1011, 1010])
+
+    # Rolling aggregates kept by the statistics observer
+    for window in ("last 3", "1 hour"):
+        stats = statistics.stats("temperature", window)
+        print(f"\nTemperature over {window}: min {stats.min}, max {stats.max}, "
+              f"mean {stats.mean:.1f}, stddev {stats.stddev:.1f}")
+
+    # Make the log durable and read it back
+    weather_logger.close()
+    with WeatherLogReader(log_path) as log:
+        print(f"\nThe weather log holds {len(log)} readings, the latest: {log[-1]}")
+
 
 if __name__ == "__main__":
     run_weather_example()
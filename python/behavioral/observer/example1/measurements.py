@@ -0,0 +1,84 @@
+from typing import NamedTuple, Tuple
+
+
+class WeatherReading(NamedTuple):
+    """
+    An immutable snapshot of a single set of weather measurements.
+    """
+    temperature: float
+    humidity: float
+    pressure: float
+
+
+def _as_column(values):
+    """Keep sized, indexable columns (lists, tuples, arrays) as they are."""
+    if hasattr(values, "__len__") and hasattr(values, "__getitem__"):
+        return values
+    return tuple(values)
+
+
+class MeasurementBatch:
+    """
+    A columnar view over a batch of weather measurements.
+
+    Each field is exposed as a whole column so batch-aware observers can
+    process every reading at once instead of one sample at a time.
+    """
+    def __init__(self, temperature, humidity, pressure):
+        self._temperature = _as_column(temperature)
+        self._humidity = _as_column(humidity)
+        self._pressure = _as_column(pressure)
+        size = len(self._temperature)
+        if len(self._humidity) != size or len(self._pressure) != size:
+            raise ValueError("Measurement columns must all have the same length")
+        self._size = size
+
+    @property
+    def temperature(self):
+        """Get the temperature column."""
+        return self._temperature
+
+    @property
+    def humidity(self):
+        """Get the humidity column."""
+        return self._humidity
+
+    @property
+    def pressure(self):
+        """Get the pressure column."""
+        return self._pressure
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index) -> WeatherReading:
+        return WeatherReading(
+            self._temperature[index],
+            self._humidity[index],
+            self._pressure[index],
+        )
+
+    def __iter__(self):
+        for values in zip(self._temperature, self._humidity, self._pressure):
+            yield WeatherReading(*values)
+
+    def take(self, indices) -> "MeasurementBatch":
+        """Get a new batch holding only the readings at the given indices."""
+        return MeasurementBatch(*(
+            column.take(indices) if hasattr(column, "take") else [column[i] for i in indices]
+            for column in (self._temperature, self._humidity, self._pressure)
+        ))
+
+    def last(self) -> WeatherReading:
+        """Get the most recent reading in the batch."""
+        return self[self._size - 1]
+
+
+class MeasurementDelta(NamedTuple):
+    """
+    Describes a delivered change: which fields changed meaningfully, the
+    readings last delivered to observers, and the new readings.
+    """
+    changed: Tuple[str, ...]
+    previous: WeatherReading
+    current: WeatherReading
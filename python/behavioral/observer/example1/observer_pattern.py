@@ -12,6 +12,36 @@ class Observer(ABC):
         """
         pass
 
+    def update_delta(self, subject, delta):
+        """
+        Receive an update along with the MeasurementDelta describing it:
+        which fields changed, and the readings last delivered before it.
+
+        Subjects that track deltas call this instead of update(). The
+        default ignores the delta; observers that only care about changed
+        fields should override this method.
+        """
+        self.update(subject)
+
+    def update_batch(self, subject, batch):
+        """
+        Receive a batch of readings from subject in a single call.
+
+        The default delivers each reading of the batch to update() in order,
+        passing the reading itself in place of the subject. Observers that
+        can process a whole batch at once should override this method.
+        """
+        for reading in batch:
+            self.update(reading)
+
+    def update_field(self, subject, event):
+        """
+        Receive a FieldEvent for a subscription made with subject.subscribe().
+
+        The default treats it like any other update.
+        """
+        self.update(subject)
+
 class Subject(ABC):
     """
     The Subject interface declares methods for managing observers.
@@ -36,3 +66,41 @@ class Subject(ABC):
         Notify all observers about an event.
         """
         pass
+
+
+class AsyncObserver(ABC):
+    """
+    The asyncio counterpart of Observer, for consumers that await I/O.
+    """
+    @abstractmethod
+    async def update(self, subject):
+        """
+        Receive update from subject.
+        """
+        pass
+
+
+class AsyncSubject(ABC):
+    """
+    The asyncio counterpart of Subject, whose notify() is a coroutine.
+    """
+    @abstractmethod
+    def attach(self, observer):
+        """
+        Attach an observer to the subject.
+        """
+        pass
+
+    @abstractmethod
+    def detach(self, observer):
+        """
+        Detach an observer from the subject.
+        """
+        pass
+
+    @abstractmethod
+    async def notify(self):
+        """
+        Notify all observers about an event.
+        """
+        pass
@@ -0,0 +1,66 @@
+import weakref
+
+
+class ObserverRegistry:
+    """
+    An insertion-ordered set of observers with O(1) add, remove and lookup.
+
+    Observers are indexed by identity. With weak=True the registry only holds
+    weak references, and an observer that is garbage collected drops out of
+    the registry on its own.
+    """
+    def __init__(self, weak: bool = False):
+        self._weak = weak
+        # id(observer) -> observer, or a weak reference to it
+        self._entries = {}
+        # Cached tuple of entries, rebuilt after the registry changes
+        self._snapshot = None
+
+    @property
+    def weak(self) -> bool:
+        """Whether observers are held by weak reference."""
+        return self._weak
+
+    def add(self, observer) -> bool:
+        """
+        Register an observer. Returns False if it was already registered.
+        """
+        key = id(observer)
+        if key in self._entries:
+            return False
+        if self._weak:
+            self._entries[key] = weakref.ref(observer, self._reaper(key))
+        else:
+            self._entries[key] = observer
+        self._snapshot = None
+        return True
+
+    def remove(self, observer) -> bool:
+        """
+        Unregister an observer. Returns False if it was not registered.
+        """
+        if self._entries.pop(id(observer), None) is None:
+            return False
+        self._snapshot = None
+        return True
+
+    def _reaper(self, key):
+        def reap(ref):
+            if self._entries.get(key) is ref:
+                del self._entries[key]
+                self._snapshot = None
+        return reap
+
+    def __contains__(self, observer):
+        return id(observer) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        entries = self._snapshot
+        if entries is None:
+            entries = self._snapshot = tuple(self._entries.values())
+        if not self._weak:
+            return iter(entries)
+        return (observer for observer in (ref() for ref in entries) if observer is not None)
@@ -0,0 +1,165 @@
+import math
+import time
+from collections import deque
+from typing import Dict, NamedTuple, Optional
+
+from measurements import WeatherReading
+from observer_pattern import Observer
+
+
+FIELDS = WeatherReading._fields
+
+
+class WindowSpec(NamedTuple):
+    """
+    Describes a window: the last `size` samples, or the samples of the
+    last `seconds`, keeping at most max_samples of them.
+    """
+    size: Optional[int] = None
+    seconds: Optional[float] = None
+    max_samples: int = 100_000
+
+
+class WindowStats(NamedTuple):
+    """
+    Aggregates over the samples currently in a window.
+    """
+    count: int
+    min: float
+    max: float
+    mean: float
+    stddev: float
+
+
+class RollingWindow:
+    """
+    Keeps min, max, mean and standard deviation of a sliding window of values.
+
+    Min and max come from monotonic deques and mean and variance are updated
+    incrementally as samples enter and leave, so every update costs
+    amortized O(1) no matter how large the window is.
+    """
+    def __init__(self, size: int = None, seconds: float = None, max_samples: int = 100_000):
+        if (size is None) == (seconds is None):
+            raise ValueError("A window needs exactly one of size or seconds")
+        if (size is not None and size < 1) or max_samples < 1:
+            raise ValueError("A window must hold at least one sample")
+        self._limit = min(size, max_samples) if size is not None else max_samples
+        self._seconds = seconds
+        self._samples = deque()  # (sequence number, timestamp, value)
+        self._minima = deque()   # (sequence number, value), values increasing
+        self._maxima = deque()   # (sequence number, value), values decreasing
+        self._sequence = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value, timestamp: float = 0.0):
+        """
+        Add a sample and drop those that fell out of the window.
+        """
+        sequence = self._sequence
+        self._sequence += 1
+        self._samples.append((sequence, timestamp, value))
+
+        count = len(self._samples)
+        delta = value - self._mean
+        self._mean += delta / count
+        self._m2 += delta * (value - self._mean)
+
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((sequence, value))
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((sequence, value))
+
+        while len(self._samples) > self._limit:
+            self._remove_oldest()
+        if self._seconds is not None:
+            self.expire(timestamp)
+
+    def expire(self, now: float):
+        """
+        Drop the samples of a time window that are older than its duration.
+        """
+        if self._seconds is None:
+            return
+        cutoff = now - self._seconds
+        while self._samples and self._samples[0][1] <= cutoff:
+            self._remove_oldest()
+
+    def _remove_oldest(self):
+        sequence, _, value = self._samples.popleft()
+        count = len(self._samples)
+        if count:
+            delta = value - self._mean
+            self._mean -= delta / count
+            self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+        else:
+            self._mean = 0.0
+            self._m2 = 0.0
+        if self._minima[0][0] == sequence:
+            self._minima.popleft()
+        if self._maxima[0][0] == sequence:
+            self._maxima.popleft()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def stats(self) -> WindowStats:
+        """
+        Get the aggregates of the window, all NaN while it is empty.
+        """
+        count = len(self._samples)
+        if not count:
+            return WindowStats(0, math.nan, math.nan, math.nan, math.nan)
+        return WindowStats(
+            count,
+            self._minima[0][1],
+            self._maxima[0][1],
+            self._mean,
+            math.sqrt(self._m2 / count),
+        )
+
+
+class RollingStatistics(Observer):
+    """
+    Observer that keeps rolling aggregates of every field over several
+    windows at once, for dashboards that need more than the latest value.
+    """
+    def __init__(self, windows: Dict[str, WindowSpec], clock=time.monotonic):
+        self._clock = clock
+        self._windows = {
+            field: {name: RollingWindow(*spec) for name, spec in windows.items()}
+            for field in FIELDS
+        }
+
+    def update(self, subject):
+        """
+        Add the latest readings to every window.
+        """
+        now = self._clock()
+        for field, windows in self._windows.items():
+            value = getattr(subject, field)
+            for window in windows.values():
+                window.add(value, now)
+
+    def update_batch(self, subject, batch):
+        """
+        Add a whole batch of readings to every window under one timestamp.
+        """
+        now = self._clock()
+        for field, windows in self._windows.items():
+            values = getattr(batch, field)
+            for window in windows.values():
+                add = window.add
+                for value in values:
+                    add(value, now)
+
+    def stats(self, field: str, window: str) -> WindowStats:
+        """
+        Get the aggregates of one field over one window.
+        """
+        rolling = self._windows[field][window]
+        rolling.expire(self._clock())
+        return rolling.stats()
@@ -0,0 +1,151 @@
+import math
+from bisect import bisect_right
+from typing import Callable, NamedTuple, Optional
+
+from measurements import WeatherReading
+
+
+FIELDS = WeatherReading._fields
+
+
+class FieldEvent(NamedTuple):
+    """
+    Describes the change of one field that a subscription matched.
+
+    entered is True when the value moved into the subscribed range, False
+    when it left it, and None for subscriptions without a range. previous
+    is None for the subject's first reading.
+    """
+    field: str
+    previous: Optional[float]
+    value: float
+    entered: Optional[bool]
+
+
+class Subscription:
+    """
+    An observer's interest in one field of a subject.
+
+    A subscription either has a half-open range [low, high), and matches
+    when the value enters or leaves it, or an optional predicate, and
+    matches on every change where the predicate holds for the new value.
+    """
+    def __init__(self, observer, field: str, low: float = None, high: float = None,
+                 predicate: Callable[[float], bool] = None):
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field {field!r}, expected one of {FIELDS}")
+        ranged = low is not None or high is not None
+        if ranged and predicate is not None:
+            raise ValueError("A subscription takes either a range or a predicate, not both")
+        self.observer = observer
+        self.field = field
+        self.predicate = predicate
+        self.ranged = ranged
+        self.low = low if low is not None else -math.inf
+        self.high = high if high is not None else math.inf
+
+    def contains(self, value) -> bool:
+        """Check whether a value lies inside the subscribed range."""
+        return self.low <= value < self.high
+
+
+class _BoundaryIndex:
+    """
+    Range subscriptions of one field, sorted by their range boundaries.
+
+    A value moving from a to b can only enter or leave ranges that have a
+    boundary in (min(a, b), max(a, b)], so finding them is a binary search
+    plus the number of boundaries crossed.
+    """
+    def __init__(self):
+        self._keys = []
+        self._subscriptions = []
+
+    def add(self, subscription: Subscription):
+        for key in (subscription.low, subscription.high):
+            if math.isfinite(key):
+                position = bisect_right(self._keys, key)
+                self._keys.insert(position, key)
+                self._subscriptions.insert(position, subscription)
+
+    def remove(self, subscription: Subscription):
+        for key in (subscription.low, subscription.high):
+            if math.isfinite(key):
+                position = bisect_right(self._keys, key) - 1
+                while self._subscriptions[position] is not subscription:
+                    position -= 1
+                del self._keys[position]
+                del self._subscriptions[position]
+
+    def crossed(self, previous, value):
+        """Get the subscriptions whose range the value entered or left."""
+        low, high = (previous, value) if previous < value else (value, previous)
+        start = bisect_right(self._keys, low)
+        stop = bisect_right(self._keys, high)
+        candidates = {id(s): s for s in self._subscriptions[start:stop]}
+        return [s for s in candidates.values() if s.contains(previous) != s.contains(value)]
+
+    def containing(self, value):
+        """Get the subscriptions whose range contains the value."""
+        candidates = {id(s): s for s in self._subscriptions}
+        return [s for s in candidates.values() if s.contains(value)]
+
+
+class SubscriptionIndex:
+    """
+    Routes field changes to the subscriptions they match, without looking
+    at subscriptions of unchanged fields or ranges that were not crossed.
+    """
+    def __init__(self):
+        self._ranges = {field: _BoundaryIndex() for field in FIELDS}
+        # id(subscription) -> subscription, for subscriptions without a range
+        self._watchers = {field: {} for field in FIELDS}
+        self._active = set()
+
+    def __len__(self):
+        return len(self._active)
+
+    def add(self, subscription: Subscription):
+        """
+        Start routing changes to a subscription.
+        """
+        if id(subscription) in self._active:
+            return
+        self._active.add(id(subscription))
+        if subscription.ranged:
+            self._ranges[subscription.field].add(subscription)
+        else:
+            self._watchers[subscription.field][id(subscription)] = subscription
+
+    def remove(self, subscription: Subscription):
+        """
+        Stop routing changes to a subscription.
+        """
+        if id(subscription) not in self._active:
+            return
+        self._active.discard(id(subscription))
+        if subscription.ranged:
+            self._ranges[subscription.field].remove(subscription)
+        else:
+            del self._watchers[subscription.field][id(subscription)]
+
+    def dispatch(self, subject, previous: Optional[WeatherReading], current: WeatherReading):
+        """
+        Deliver a FieldEvent to every subscription the change matches.
+
+        With previous None, current is the subject's first reading: it
+        enters every range that contains it and leaves none.
+        """
+        if previous is None:
+            previous = (None,) * len(FIELDS)
+        for field, old, new in zip(FIELDS, previous, current):
+            if old == new:
+                continue
+            ranges = self._ranges[field]
+            crossed = ranges.containing(new) if old is None else ranges.crossed(old, new)
+            for subscription in crossed:
+                event = FieldEvent(field, old, new, subscription.contains(new))
+                subscription.observer.update_field(subject, event)
+            for subscription in list(self._watchers[field].values()):
+                if subscription.predicate is None or subscription.predicate(new):
+                    subscription.observer.update_field(subject, FieldEvent(field, old, new, None))
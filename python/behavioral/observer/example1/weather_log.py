@@ -0,0 +1,183 @@
+import mmap
+import os
+import struct
+import time
+import weakref
+from typing import NamedTuple
+
+
+# Every log file starts with this header, followed by fixed-size records
+MAGIC = b"WXLOG001"
+# timestamp in integer nanoseconds, temperature, humidity, pressure
+_RECORD = struct.Struct("<qddd")
+
+
+class LogRecord(NamedTuple):
+    """
+    A single logged reading.
+    """
+    timestamp_ns: int
+    temperature: float
+    humidity: float
+    pressure: float
+
+
+def _commit_and_close(file, buffer: bytearray):
+    """
+    Write a writer's buffered records and close its file. Runs on close(),
+    and otherwise when the writer is garbage collected or the interpreter
+    exits, so records are not lost when close() is never called.
+    """
+    if file.closed:
+        return
+    try:
+        if buffer:
+            file.write(buffer)
+            buffer.clear()
+            file.flush()
+            os.fsync(file.fileno())
+    finally:
+        file.close()
+
+
+class WeatherLogWriter:
+    """
+    Appends readings to a binary log file. Opening an existing log drops
+    a partial record left at its end by a crash.
+
+    Records are buffered in memory and written with a single write and fsync
+    (a group commit) once commit_bytes are pending or commit_interval seconds
+    have passed since the last commit. The interval is only checked on
+    append: a writer that stops receiving readings commits nothing until
+    commit() or close() is called. Records still buffered when the writer is
+    garbage collected or the interpreter exits are committed then, but only
+    commit() and close() make the tail of the log durable at a known point.
+    """
+    def __init__(self, path, commit_bytes: int = 64 * 1024, commit_interval: float = 1.0):
+        self._file = open(path, "ab")
+        size = self._file.tell()
+        with open(path, "rb") as existing:
+            header = existing.read(len(MAGIC))
+        if size < len(MAGIC) and MAGIC.startswith(header):
+            # A new log, or a crash while its header was being written
+            self._file.truncate(0)
+            self._file.write(MAGIC)
+        elif header != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a weather log")
+        else:
+            complete = len(MAGIC) + (size - len(MAGIC)) // _RECORD.size * _RECORD.size
+            if complete != size:
+                # Drop a record torn by a crash; appending after it would
+                # shift every later record
+                self._file.truncate(complete)
+        self._buffer = bytearray()
+        self._finalizer = weakref.finalize(self, _commit_and_close, self._file, self._buffer)
+        self._commit_bytes = commit_bytes
+        self._commit_interval = commit_interval
+        self._last_commit = time.monotonic()
+
+    def append(self, timestamp_ns: int, temperature, humidity, pressure):
+        """
+        Buffer one reading, committing if a threshold has been reached.
+        """
+        self._buffer += _RECORD.pack(timestamp_ns, temperature, humidity, pressure)
+        self._maybe_commit()
+
+    def append_batch(self, timestamp_ns: int, batch):
+        """
+        Buffer every reading of a MeasurementBatch under one timestamp.
+        """
+        pack = _RECORD.pack
+        for temperature, humidity, pressure in zip(batch.temperature, batch.humidity, batch.pressure):
+            self._buffer += pack(timestamp_ns, temperature, humidity, pressure)
+        self._maybe_commit()
+
+    def _maybe_commit(self):
+        if (len(self._buffer) >= self._commit_bytes
+                or time.monotonic() - self._last_commit >= self._commit_interval):
+            self.commit()
+
+    def commit(self):
+        """
+        Write all buffered records and fsync them to disk.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        """
+        Commit any buffered records and close the file.
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class WeatherLogReader:
+    """
+    Reads a binary weather log through a read-only memory map.
+
+    Records are decoded straight from the mapped pages, so scanning a log
+    does not read the whole file into memory or parse any text. A record
+    cut short by a crash at the end of the log is ignored.
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(MAGIC) or self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a weather log")
+        self._count = (size - len(MAGIC)) // _RECORD.size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index) -> LogRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("log record index out of range")
+        return LogRecord(*_RECORD.unpack_from(self._mmap, len(MAGIC) + index * _RECORD.size))
+
+    def __iter__(self):
+        end = len(MAGIC) + self._count * _RECORD.size
+        with memoryview(self._mmap) as view:
+            for values in _RECORD.iter_unpack(view[len(MAGIC):end]):
+                yield LogRecord(*values)
+
+    def to_numpy(self):
+        """
+        Get the log as a NumPy structured array backed by the memory map,
+        without copying. Requires NumPy.
+        """
+        import numpy as np
+        dtype = np.dtype([
+            ("timestamp_ns", "<i8"),
+            ("temperature", "<f8"),
+            ("humidity", "<f8"),
+            ("pressure", "<f8"),
+        ])
+        return np.frombuffer(self._mmap, dtype=dtype, count=self._count, offset=len(MAGIC))
+
+    def close(self):
+        """
+        Unmap and close the log file.
+        """
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
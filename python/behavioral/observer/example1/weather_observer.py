@@ -1,4 +1,10 @@
+import time
+from itertools import groupby
+from operator import itemgetter
+
+from alert_rules import DEFAULT_RULES, RuleTable
 from observer_pattern import Observer
+from weather_log import WeatherLogWriter
 
 class WeatherDisplay(Observer):
     """
@@ -16,63 +22,96 @@ class WeatherDisplay(Observer):
         print(f"Humidity: {subject.humidity}%")
         print(f"Pressure: {subject.pressure} hPa")
 
+    def update_batch(self, subject, batch):
+        """
+        A display only shows the latest conditions, so a batch is drawn once.
+        """
+        self.update(subject)
+
 class AlertSystem(Observer):
     """
     Alert system that notifies when weather conditions reach critical values.
+    The conditions are rows of a RuleTable, so operators can add their own.
     """
+    def __init__(self, rules=DEFAULT_RULES):
+        self._rules = RuleTable(rules)
+
+    @property
+    def rules(self) -> RuleTable:
+        """Get the alert rule table."""
+        return self._rules
+
     def update(self, subject):
         """
         Check weather conditions and issue alerts if necessary.
         """
-        warnings = []
-
-        # Temperature alerts
-        if subject.temperature > 30:
-            warnings.append("HEAT WARNING: Temperature above 30°C")
-        elif subject.temperature < 0:
-            warnings.append("FROST WARNING: Temperature below 0°C")
+        self._report([rule.message for rule in self._rules.check(subject)])
 
-        # Humidity alerts
-        if subject.humidity > 90:
-            warnings.append("HIGH HUMIDITY WARNING: Humidity above 90%")
-        elif subject.humidity < 20:
-            warnings.append("LOW HUMIDITY WARNING: Very dry conditions")
-
-        # Pressure alerts
-        if subject.pressure < 970:
-            warnings.append("STORM WARNING: Low pressure system")
-        elif subject.pressure > 1040:
-            warnings.append("HIGH PRESSURE: Stable weather system")
+    def update_batch(self, subject, batch):
+        """
+        Evaluate the rules over the whole batch at once, then report the
+        alerts of each reading that raised any. Without NumPy the readings
+        are checked one at a time instead.
+        """
+        try:
+            matches = self._rules.evaluate(batch)
+        except ImportError:
+            for reading in batch:
+                self.update(reading)
+            return
+        rules = self._rules.rules
+        pairs = zip(matches.indices.tolist(), matches.rule_ids.tolist())
+        for _, group in groupby(pairs, key=itemgetter(0)):
+            self._report([rules[rule_id].message for _, rule_id in group])
 
+    def _report(self, warnings):
         if warnings:
             print("\nWEATHER ALERTS:")
             for warning in warnings:
                 print(f" - {warning}")
 
+class ThresholdAlert(Observer):
+    """
+    Alert for a single condition, registered with WeatherStation.subscribe()
+    so it only hears about readings that cross its range.
+    """
+    def __init__(self, message):
+        self.message = message
+
+    def update(self, subject):
+        """
+        Threshold alerts ignore ordinary updates.
+        """
+        pass
+
+    def update_field(self, subject, event):
+        """
+        Issue the alert when the reading enters the subscribed range.
+        """
+        if event.entered:
+            print(f"\nALERT: {self.message} ({event.field} {event.value})")
+
 class WeatherLogger(Observer):
     """
-    Logger that records weather data for analysis.
+    Logger that records weather data for analysis in a binary weather log.
     """
+    def __init__(self, path="weather.log", writer: WeatherLogWriter = None):
+        self._writer = writer if writer is not None else WeatherLogWriter(path)
+
     def update(self, subject):
         """
         Log weather data from the weather station.
         """
-        log_entry = (
-            f"TIME: {self._get_current_time()}, "
-            f"TEMP: {subject.temperature}°C, "
-            f"HUMIDITY: {subject.humidity}%, "
-            f"PRESSURE: {subject.pressure} hPa"
-        )
-        
-        print("\nWeather Log Entry:")
-        print(log_entry)
-        print("Data logged to weather.log")
-        
-        # In a real implementation, we would actually write to a file here
-        # with open('weather.log', 'a') as log_file:
-        #     log_file.write(log_entry + '\n')
-
-    def _get_current_time(self):
-        """Get current time for logging purposes."""
-        from datetime import datetime
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._writer.append(time.time_ns(), subject.temperature, subject.humidity, subject.pressure)
+
+    def update_batch(self, subject, batch):
+        """
+        Log a whole batch of weather data under a single timestamp.
+        """
+        self._writer.append_batch(time.time_ns(), batch)
+
+    def close(self):
+        """
+        Commit pending log entries and close the log.
+        """
+        self._writer.close()
@@ -1,47 +1,178 @@
-from typing import List
-
+from deadband import ChangeDetector
+from dispatchers import Dispatcher, InlineDispatcher
+from measurements import MeasurementBatch, MeasurementDelta, WeatherReading
 from observer_pattern import Subject, Observer
+from observer_registry import ObserverRegistry
+from subscriptions import Subscription, SubscriptionIndex
 
 
 class WeatherStation(Subject):
     """
     The WeatherStation maintains a state and notifies observers when it changes.
+
+    How the observers run is up to the dispatcher; by default they are
+    updated inline on the thread that changes the measurements. With
+    weak_observers=True the station does not keep its observers alive.
     """
-    def __init__(self):
-        self._observers: List[Observer] = []
+    def __init__(self, dispatcher: Dispatcher = None, weak_observers: bool = False):
+        self._observers = ObserverRegistry(weak=weak_observers)
+        self._dispatcher = dispatcher if dispatcher is not None else InlineDispatcher()
+        self._subscriptions = SubscriptionIndex()
         self._temperature = 0
         self._humidity = 0
         self._pressure = 0
+        # Subscriptions see the first reading as entering its ranges, not
+        # as a change from these placeholder zeros
+        self._has_reading = False
+        self._changes = ChangeDetector(self.snapshot())
+        self._delta = MeasurementDelta((), self.snapshot(), self.snapshot())
+        self._delivered_notifications = 0
+        self._suppressed_notifications = 0
 
     def attach(self, observer: Observer):
         """
         Attach an observer to the weather station.
         """
-        if observer not in self._observers:
-            self._observers.append(observer)
+        self._observers.add(observer)
 
     def detach(self, observer):
         """
         Detach an observer from the weather station.
         """
-        if observer in self._observers:
-            self._observers.remove(observer)
+        self._observers.remove(observer)
+
+    def subscribe(self, observer: Observer, field: str, low=None, high=None,
+                  predicate=None) -> Subscription:
+        """
+        Subscribe an observer to changes of a single field.
+
+        With low and/or high, the observer's update_field() is called when
+        the field enters or leaves the range [low, high). With a predicate,
+        or with neither, it is called on every change of the field for which
+        the predicate holds. Subscribing does not attach the observer.
+        """
+        subscription = Subscription(observer, field, low, high, predicate)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Cancel a subscription made with subscribe().
+        """
+        self._subscriptions.remove(subscription)
+
+    def set_deadband(self, field: str, absolute: float = 0.0, relative: float = 0.0):
+        """
+        Only notify observers when a field moves further than absolute, or
+        than relative times its last delivered value, from that value.
+
+        Once any field has a deadband, readings that change nothing
+        meaningfully are suppressed; fields without one report any change.
+        """
+        self._changes.set_deadband(field, absolute, relative)
+
+    def clear_deadband(self, field: str):
+        """
+        Remove the deadband of a field.
+        """
+        self._changes.clear_deadband(field)
 
     def notify(self):
         """
-        Notify all observers about weather changes.
+        Notify all observers about weather changes, passing the delta of
+        the last delivered reading to their update_delta().
         """
-        for observer in self._observers:
-            observer.update(self)
+        self._dispatcher.dispatch(self._observers, self, self._delta)
+
+    def notify_batch(self, batch: MeasurementBatch):
+        """
+        Notify all observers about a batch of weather changes at once.
+        """
+        self._dispatcher.dispatch_batch(self._observers, self, batch)
 
     def set_measurements(self, temperature, humidity, pressure):
         """
         Set new weather measurements and notify observers.
         """
+        previous = self.snapshot() if self._has_reading else None
+        self._has_reading = True
         self._temperature = temperature
         self._humidity = humidity
         self._pressure = pressure
-        self.notify()
+        current = self.snapshot()
+        if self._detect_change(current):
+            self.notify()
+        if self._subscriptions:
+            self._subscriptions.dispatch(self, previous, current)
+
+    def set_measurements_batch(self, temperatures, humidities, pressures):
+        """
+        Set a batch of weather measurements and notify observers once.
+
+        Each argument is an array or iterable with one value per reading.
+        After the call the station holds the last reading of the batch.
+        """
+        batch = MeasurementBatch(temperatures, humidities, pressures)
+        if not len(batch):
+            return
+        before = self.snapshot()
+        previous = before if self._has_reading else None
+        self._has_reading = True
+        self._temperature, self._humidity, self._pressure = batch.last()
+        if self._subscriptions:
+            for reading in batch:
+                self._subscriptions.dispatch(self, previous, reading)
+                previous = reading
+        if not self._changes.active:
+            # Every reading is delivered; the delta is the last one's
+            self._changes.reset(batch[len(batch) - 2] if len(batch) > 1 else before)
+            self._detect_change(batch.last())
+            self._delivered_notifications += len(batch) - 1
+            self.notify_batch(batch)
+            return
+        changed = [index for index, reading in enumerate(batch) if self._detect_change(reading)]
+        if len(changed) == len(batch):
+            self.notify_batch(batch)
+        elif changed:
+            self.notify_batch(batch.take(changed))
+
+    def _detect_change(self, reading: WeatherReading) -> bool:
+        """
+        Record whether a reading should reach observers, and its delta.
+        """
+        delta = self._changes.detect(reading)
+        if delta is None:
+            if self._changes.active:
+                self._suppressed_notifications += 1
+                return False
+            delta = MeasurementDelta((), reading, reading)
+        self._delta = delta
+        self._delivered_notifications += 1
+        return True
+
+    def snapshot(self) -> WeatherReading:
+        """Get an immutable copy of the current readings."""
+        return WeatherReading(self._temperature, self._humidity, self._pressure)
+
+    @property
+    def delta(self) -> MeasurementDelta:
+        """Get the fields changed by the last delivered reading."""
+        return self._delta
+
+    @property
+    def delivered_notifications(self) -> int:
+        """Get how many readings were delivered to observers."""
+        return self._delivered_notifications
+
+    @property
+    def suppressed_notifications(self) -> int:
+        """Get how many readings were suppressed by the deadbands."""
+        return self._suppressed_notifications
+
+    @property
+    def dispatcher(self) -> Dispatcher:
+        """Get the dispatcher that runs observer updates."""
+        return self._dispatcher
 
     @property
     def temperature(self):
@@ -0,0 +1,53 @@
+"""
+Bulk Pricing Benchmark
+
+Prices random orders both by building decorator objects and calling cost(),
+and with price_orders() on arrays. Every cost must be exactly equal; the
+script fails otherwise. Run from the repository root:
+
+    python -m python.structural.decorator.example1.bench_bulk_pricing
+"""
+import argparse
+import time
+
+import numpy as np
+
+from python.structural.decorator.example1.bulk_pricing import ADD_ONS, SIZES, build_order, price_orders
+
+
+def random_orders(count, max_add_ons, seed):
+    rng = np.random.default_rng(seed)
+    add_on_counts = rng.integers(0, max_add_ons + 1, size=(count, len(ADD_ONS)))
+    size_codes = rng.integers(0, len(SIZES), size=count)
+    shots = rng.integers(0, 4, size=count)
+    return add_on_counts, size_codes, shots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--max-add-ons", type=int, default=3, help="most units of one add-on per order")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    add_on_counts, size_codes, shots = random_orders(args.orders, args.max_add_ons, args.seed)
+
+    start = time.perf_counter()
+    expected = [
+        build_order(counts, size, shot).cost()
+        for counts, size, shot in zip(add_on_counts.tolist(), size_codes.tolist(), shots.tolist())
+    ]
+    objects = time.perf_counter() - start
+
+    start = time.perf_counter()
+    costs = price_orders(add_on_counts, size_codes, shots)
+    bulk = time.perf_counter() - start
+
+    mismatches = np.flatnonzero(costs != np.asarray(expected))
+    assert not len(mismatches), f"{len(mismatches)} costs differ, first at order {mismatches[0]}"
+    print(f"orders={args.orders}  objects={args.orders / objects:12,.0f} orders/s  "
+          f"bulk={args.orders / bulk:12,.0f} orders/s  speedup={objects / bulk:6.1f}x  (costs identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Coffee Memory Benchmark
+
+Measures with tracemalloc how many bytes a decorated order takes at several
+depths: a SimpleCoffee with add-ons, sized outermost. "priced" also counts
+the pricing plan cost() caches. Run with --baseline to compare against the
+same classes with a per-instance __dict__, as they were before they
+declared __slots__. Run from the repository root:
+
+    python -m python.structural.decorator.example1.bench_memory
+"""
+import argparse
+import gc
+import tracemalloc
+
+from python.structural.decorator.example1.bulk_pricing import ADD_ONS
+from python.structural.decorator.example1.coffee import SimpleCoffee
+from python.structural.decorator.example1.decorators import SizeDecorator
+
+
+def with_dict(cls):
+    """Subclass cls without __slots__, which gives instances a __dict__."""
+    return type(f"Dict{cls.__name__}", (cls,), {})
+
+
+def build_orders(count, depth, base, add_ons, size):
+    orders = []
+    for _ in range(count):
+        coffee = base()
+        for level in range(depth - 1):
+            coffee = add_ons[level % len(add_ons)](coffee)
+        orders.append(size(coffee, "large"))
+    return orders
+
+
+def measure(count, depth, classes):
+    """
+    Get the bytes per order after building count orders, and after pricing them.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    orders = build_orders(count, depth, *classes)
+    built = tracemalloc.get_traced_memory()[0] - start
+    for order in orders:
+        order.cost()
+    priced = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    # The list holding the orders is not part of their cost
+    overhead = len(orders) * 8
+    return (built - overhead) / count, (priced - overhead) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--baseline", action="store_true",
+                        help="also measure the classes with a __dict__")
+    args = parser.parse_args()
+
+    layouts = [("slots", (SimpleCoffee, ADD_ONS, SizeDecorator))]
+    if args.baseline:
+        layouts.append(("dict", (with_dict(SimpleCoffee), [with_dict(cls) for cls in ADD_ONS],
+                                 with_dict(SizeDecorator))))
+    for name, classes in layouts:
+        for depth in args.depths:
+            built, priced = measure(args.orders, depth, classes)
+            print(f"{name:<6} depth={depth:<3} built={built:8.1f} B/order  priced={priced:8.1f} B/order")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Bulk Order Pricing
+
+Prices many orders at once from arrays instead of decorator objects. An
+order is a simple coffee with some add-ons, extra shots and a size, and is
+priced as if it had been built by build_order(): one decorator per add-on in
+ADD_ONS order, then the extra shots, then the size outermost.
+
+Requires NumPy.
+"""
+from typing import Sequence
+
+from python.structural.decorator.example1.coffee import Coffee, SimpleCoffee
+from python.structural.decorator.example1.decorators import (
+    CaramelDecorator,
+    ExtraShotDecorator,
+    MilkDecorator,
+    SizeDecorator,
+    SoyDecorator,
+    VanillaDecorator,
+    WhipDecorator,
+)
+
+
+# The columns of an add-on count array
+ADD_ONS = (MilkDecorator, WhipDecorator, VanillaDecorator, CaramelDecorator, SoyDecorator)
+# Size codes index this tuple
+SIZES = tuple(SizeDecorator.SIZE_FACTORS)
+
+
+def build_order(add_on_counts: Sequence[int], size_code: int, shots: int) -> Coffee:
+    """
+    Build the decorated coffee an order stands for.
+    """
+    coffee = SimpleCoffee()
+    for decorator, count in zip(ADD_ONS, add_on_counts):
+        for _ in range(count):
+            coffee = decorator(coffee)
+    if shots:
+        coffee = ExtraShotDecorator(coffee, shots)
+    return SizeDecorator(coffee, SIZES[size_code])
+
+
+def price_orders(add_on_counts, size_codes, shots):
+    """
+    Price orders given as arrays, returning a float64 array of costs.
+
+    Args:
+        add_on_counts: Integers of shape (orders, len(ADD_ONS)), how many of
+                       each add-on every order has
+        size_codes: Integers of shape (orders,), indexes into SIZES
+        shots: Integers of shape (orders,), extra shots per order
+
+    Each add-on is added once per unit, in build order, so every order goes
+    through exactly the float additions its decorators would make and the
+    costs match cost() bit for bit.
+    """
+    import numpy as np
+    add_on_counts = np.asarray(add_on_counts, dtype=np.int64)
+    size_codes = np.asarray(size_codes, dtype=np.intp)
+    shots = np.asarray(shots, dtype=np.int64)
+    if add_on_counts.ndim != 2 or add_on_counts.shape[1] != len(ADD_ONS):
+        raise ValueError(f"add_on_counts must have shape (orders, {len(ADD_ONS)})")
+
+    costs = np.full(len(add_on_counts), SimpleCoffee().cost(), dtype=np.float64)
+    for column, decorator in enumerate(ADD_ONS):
+        counts = add_on_counts[:, column]
+        for unit in range(int(counts.max(initial=0))):
+            # Only orders with more than `unit` of this add-on get it again
+            np.add(costs, decorator.PRICE, out=costs, where=counts > unit)
+    # An order without shots has no ExtraShotDecorator, and x + 0.0 == x
+    costs += ExtraShotDecorator.PRICE * shots
+    factors = np.asarray([SizeDecorator.SIZE_FACTORS[size] for size in SIZES], dtype=np.float64)
+    costs *= factors[size_codes]
+    return costs
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import TextIO
 
 
 class Coffee(ABC):
     """
     The Component interface defines operations that can be altered by decorators.
     """
+    __slots__ = ()
     @abstractmethod
     def get_description(self) -> str:
         """
@@ -19,11 +21,25 @@ class Coffee(ABC):
         """
         pass
 
+    def write_description(self, stream: TextIO):
+        """
+        Writes the description to a stream, such as an open file or io.StringIO.
+        """
+        stream.write(self.get_description())
+
+    def config(self) -> tuple:
+        """
+        Returns the parameters that tell this coffee apart from others of the
+        same type. Classes taking parameters must override it.
+        """
+        return ()
+
 
 class SimpleCoffee(Coffee):
     """
     Concrete Components provide default implementations of the operations.
     """
+    __slots__ = ()
     def get_description(self) -> str:
         return "Simple coffee"
 
@@ -1,113 +1,218 @@
+from typing import List, Optional, TextIO
+
 from python.structural.decorator.example1.coffee import Coffee
+from python.structural.decorator.example1.description import PREFIX, SUFFIX, DescriptionPart
+from python.structural.decorator.example1.pricing import ADD, MUL, PricingPlan, PricingStep, shared_step
 
 
 class CoffeeDecorator(Coffee):
     """
     The base Decorator class follows the same interface as the Component.
     The primary purpose is to define the wrapping interface for all concrete decorators.
+    Decorators declare __slots__, so a wrapper holds only its fields and no __dict__.
     """
+    __slots__ = ("_coffee", "_plan")
+
     def __init__(self, coffee: Coffee):
         self._coffee = coffee
+        self._plan: Optional[PricingPlan] = None
 
     @property
     def coffee(self) -> Coffee:
         return self._coffee
 
+    def description_part(self) -> Optional[DescriptionPart]:
+        """
+        Returns the text this decorator adds to the description, or None if
+        it adds nothing. Concrete decorators declare a part instead of
+        overriding get_description().
+        """
+        return None
+
+    def description_parts(self) -> List[str]:
+        """
+        Collects the description's pieces in order in one pass over the
+        chain, so joining them takes time linear in its length.
+
+        A decorator that overrides get_description() itself is opaque: its
+        description is used as the text of the innermost piece.
+        """
+        prefixes = []
+        suffixes = []
+        coffee = self
+        while coffee is self or (isinstance(coffee, CoffeeDecorator)
+                                 and type(coffee).get_description is CoffeeDecorator.get_description):
+            part = coffee.description_part()
+            if part is not None:
+                if part.position == PREFIX:
+                    prefixes.append(part.text)
+                else:
+                    suffixes.append(part.text)
+            coffee = coffee.coffee
+        prefixes.append(coffee.get_description())
+        suffixes.reverse()
+        prefixes.extend(suffixes)
+        return prefixes
+
     def get_description(self) -> str:
-        return self._coffee.get_description()
+        return "".join(self.description_parts())
+
+    def write_description(self, stream: TextIO):
+        if type(self).get_description is not CoffeeDecorator.get_description:
+            stream.write(self.get_description())
+        else:
+            stream.writelines(self.description_parts())
+
+    def pricing_step(self) -> Optional[PricingStep]:
+        """
+        Returns how this decorator changes the price, or None if it does not.
+        Concrete decorators declare a step instead of overriding cost().
+        """
+        return None
+
+    def pricing_plan(self) -> PricingPlan:
+        """
+        Compiles the chain of decorators into a flat PricingPlan, walking it
+        iteratively so its depth is not limited by the recursion limit.
+
+        A decorator that overrides cost() itself is opaque to the plan: its
+        cost() becomes the plan's base price. So does the total of an inner
+        decorator that has already been priced. The decorator the plan is
+        compiled for is always walked, so an override calling super().cost()
+        gets the plan of its own chain.
+        """
+        steps = []
+        coffee = self
+        while coffee is self or (isinstance(coffee, CoffeeDecorator)
+                                 and type(coffee).cost is CoffeeDecorator.cost):
+            if coffee is not self and coffee._plan is not None:
+                break
+            step = coffee.pricing_step()
+            if step is not None:
+                steps.append(step)
+            coffee = coffee.coffee
+        steps.reverse()
+        return PricingPlan(coffee.cost(), tuple(steps))
 
     def cost(self) -> float:
-        return self._coffee.cost()
+        if self._plan is None:
+            self._plan = self.pricing_plan()
+        return self._plan.total
 
 
 class MilkDecorator(CoffeeDecorator):
     """
     Concrete Decorators add responsibilities to the component.
     """
-    def get_description(self) -> str:
-        return f"{self.coffee.get_description()}, milk"
+    PRICE = 0.5
+    __slots__ = ()
 
-    def cost(self) -> float:
-        return self.coffee.cost() + 0.5
+    def description_part(self) -> DescriptionPart:
+        return DescriptionPart(SUFFIX, ", milk")
+
+    def pricing_step(self) -> PricingStep:
+        return shared_step(ADD, self.PRICE)
 
 
 class WhipDecorator(CoffeeDecorator):
     """
     Concrete Decorators can call parent implementation and then add their own behavior.
     """
-    def get_description(self) -> str:
-        return f"{self.coffee.get_description()}, whip"
+    PRICE = 0.7
+    __slots__ = ()
 
-    def cost(self) -> float:
-        return self.coffee.cost() + 0.7
+    def description_part(self) -> DescriptionPart:
+        return DescriptionPart(SUFFIX, ", whip")
+
+    def pricing_step(self) -> PricingStep:
+        return shared_step(ADD, self.PRICE)
 
 
 class VanillaDecorator(CoffeeDecorator):
     """
     Concrete Decorators can execute their behavior before or after the call to a wrapped object.
     """
-    def get_description(self) -> str:
-        return f"{self.coffee.get_description()}, vanilla"
+    PRICE = 0.3
+    __slots__ = ()
 
-    def cost(self) -> float:
-        return self.coffee.cost() + 0.3
+    def description_part(self) -> DescriptionPart:
+        return DescriptionPart(SUFFIX, ", vanilla")
+
+    def pricing_step(self) -> PricingStep:
+        return shared_step(ADD, self.PRICE)
 
 
 class CaramelDecorator(CoffeeDecorator):
     """
     Decorators can execute their behavior in place of the call to the wrapped object.
     """
-    def get_description(self) -> str:
-        return f"{self.coffee.get_description()}, caramel"
+    PRICE = 0.6
+    __slots__ = ()
 
-    def cost(self) -> float:
-        return self.coffee.cost() + 0.6
+    def description_part(self) -> DescriptionPart:
+        return DescriptionPart(SUFFIX, ", caramel")
+
+    def pricing_step(self) -> PricingStep:
+        return shared_step(ADD, self.PRICE)
 
 
 class SoyDecorator(CoffeeDecorator):
     """
     Decorators can modify return values of the wrapped object.
     """
-    def get_description(self) -> str:
-        return f"{self.coffee.get_description()}, soy milk"
+    PRICE = 0.4
+    __slots__ = ()
 
-    def cost(self) -> float:
-        return self.coffee.cost() + 0.4
+    def description_part(self) -> DescriptionPart:
+        return DescriptionPart(SUFFIX, ", soy milk")
+
+    def pricing_step(self) -> PricingStep:
+        return shared_step(ADD, self.PRICE)
 
 
 class SizeDecorator(CoffeeDecorator):
     """
     Decorators can also take parameters to modify their behavior.
     """
+    SIZE_FACTORS = {
+        "small": 0.8,
+        "medium": 1.0,
+        "large": 1.3
+    }
+    __slots__ = ("_size",)
+
     def __init__(self, coffee: Coffee, size: str = "medium"):
         super().__init__(coffee)
         self._size = size.lower()
-        self._size_factors = {
-            "small": 0.8,
-            "medium": 1.0,
-            "large": 1.3
-        }
 
-    def get_description(self) -> str:
-        return f"{self._size.capitalize()} {self.coffee.get_description()}"
+    def config(self) -> tuple:
+        return (self._size,)
 
-    def cost(self) -> float:
-        factor = self._size_factors.get(self._size, 1.0)
-        return self.coffee.cost() * factor
+    def description_part(self) -> DescriptionPart:
+        return DescriptionPart(PREFIX, f"{self._size.capitalize()} ")
+
+    def pricing_step(self) -> PricingStep:
+        return shared_step(MUL, self.SIZE_FACTORS.get(self._size, 1.0))
 
 
 class ExtraShotDecorator(CoffeeDecorator):
     """
     Decorators can define new behavior.
     """
+    PRICE = 0.6
+    __slots__ = ("_shots",)
+
     def __init__(self, coffee: Coffee, shots: int = 1):
         super().__init__(coffee)
         self._shots = shots
 
-    def get_description(self) -> str:
+    def config(self) -> tuple:
+        return (self._shots,)
+
+    def description_part(self) -> DescriptionPart:
         if self._shots == 1:
-            return f"{self.coffee.get_description()}, extra shot"
-        return f"{self.coffee.get_description()}, {self._shots} extra shots"
+            return DescriptionPart(SUFFIX, ", extra shot")
+        return DescriptionPart(SUFFIX, f", {self._shots} extra shots")
 
-    def cost(self) -> float:
-        return self.coffee.cost() + (0.6 * self._shots)
+    def pricing_step(self) -> PricingStep:
+        return shared_step(ADD, self.PRICE * self._shots)
@@ -0,0 +1,24 @@
+from typing import Iterable, NamedTuple, TextIO
+
+
+PREFIX = "prefix"
+SUFFIX = "suffix"
+
+
+class DescriptionPart(NamedTuple):
+    """
+    One decorator's text in the description of the coffee it wraps: put
+    before (PREFIX) or after (SUFFIX) the wrapped coffee's description.
+    """
+    position: str  # PREFIX or SUFFIX
+    text: str
+
+
+def write_receipts(coffees: Iterable, stream: TextIO):
+    """
+    Write one description line per coffee to a stream, without building
+    the descriptions as strings first.
+    """
+    for coffee in coffees:
+        coffee.write_description(stream)
+        stream.write("\n")
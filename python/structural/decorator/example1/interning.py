@@ -0,0 +1,99 @@
+import copy
+import threading
+import weakref
+
+from python.structural.decorator.example1.coffee import Coffee
+from python.structural.decorator.example1.decorators import CoffeeDecorator
+
+
+class InternedCoffee(Coffee):
+    """
+    The shared instance of one coffee configuration, with its cost and
+    description computed once.
+
+    It wraps a copy of the configuration's outermost decorator, and that
+    copy wraps the InternedCoffee of the configuration without it. Orders
+    sharing a prefix of decorators therefore share its instances, and each
+    new configuration costs one decorator and one step to price.
+    """
+    __slots__ = ("_coffee", "_key", "_cost", "_description", "__weakref__")
+
+    def __init__(self, coffee: Coffee, key: tuple):
+        self._coffee = coffee
+        self._key = key
+        self._cost = coffee.cost()
+        self._description = coffee.get_description()
+
+    @property
+    def coffee(self) -> Coffee:
+        return self._coffee
+
+    @property
+    def key(self) -> tuple:
+        return self._key
+
+    def get_description(self) -> str:
+        return self._description
+
+    def cost(self) -> float:
+        return self._cost
+
+
+class CoffeeInterner:
+    """
+    Resolves structurally identical coffees (same base, same decorator types
+    and parameters, in the same order) to one InternedCoffee.
+
+    The table holds its instances weakly, so configurations no order uses
+    any more are reclaimed.
+    """
+    def __init__(self):
+        self._table = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: tuple, coffee: Coffee) -> InternedCoffee:
+        interned = self._table.get(key)
+        if interned is None:
+            with self._lock:
+                interned = self._table.get(key)
+                if interned is None:
+                    interned = InternedCoffee(coffee, key)
+                    self._table[key] = interned
+        return interned
+
+    def intern(self, coffee: Coffee) -> InternedCoffee:
+        """
+        Returns the shared instance of the coffee's configuration.
+        """
+        layers = []
+        while isinstance(coffee, CoffeeDecorator):
+            layers.append(coffee)
+            coffee = coffee.coffee
+        if isinstance(coffee, InternedCoffee):
+            current = coffee
+        else:
+            current = self._lookup((type(coffee), coffee.config()), coffee)
+        for decorator in reversed(layers):
+            key = (type(decorator), decorator.config(), current)
+            interned = self._table.get(key)
+            if interned is None:
+                node = copy.copy(decorator)
+                node._coffee = current
+                node._plan = None
+                interned = self._lookup(key, node)
+            current = interned
+        return current
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+# The interner intern_coffee uses
+interner = CoffeeInterner()
+
+
+def intern_coffee(coffee: Coffee) -> InternedCoffee:
+    """
+    Returns the shared instance of the coffee's configuration.
+    """
+    return interner.intern(coffee)
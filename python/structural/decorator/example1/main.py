@@ -10,6 +10,8 @@ Key components:
 - Decorator: Base class for all decorators, maintains a reference to a Component
 - ConcreteDecorator: Adds specific responsibilities to the component
 """
+import sys
+
 from python.structural.decorator.example1.coffee import SimpleCoffee
 from python.structural.decorator.example1.decorators import (
     MilkDecorator,
@@ -20,6 +22,8 @@ from python.structural.decorator.example1.decorators import (
     ExtraShotDecorator,
     SoyDecorator,
 )
+from python.structural.decorator.example1.description import write_receipts
+from python.structural.decorator.example1.interning import intern_coffee
 
 
 def run_coffee_example():
@@ -57,6 +61,22 @@ def run_coffee_example():
     )
     print(f"{complex_order.get_description()} costs ${complex_order.cost():.2f}")
 
+    # Deep chains are priced from a flat plan, compiled once and cached
+    deep_order = SimpleCoffee()
+    for _ in range(5000):
+        deep_order = MilkDecorator(deep_order)
+    plan = deep_order.pricing_plan()
+    print(f"A coffee with {len(plan.steps)} milk add-ons costs ${deep_order.cost():.2f}")
+
+    # Identical configurations resolve to one shared, interned instance
+    first = intern_coffee(WhipDecorator(MilkDecorator(SimpleCoffee())))
+    second = intern_coffee(WhipDecorator(MilkDecorator(SimpleCoffee())))
+    print(f"{second.get_description()} costs ${second.cost():.2f} (shared instance: {first is second})")
+
+    # Receipts are rendered straight into a stream
+    print("Receipts:")
+    write_receipts([fancy_coffee, large_coffee, complex_order], sys.stdout)
+
 
 if __name__ == "__main__":
     run_coffee_example()
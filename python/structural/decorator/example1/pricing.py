@@ -0,0 +1,53 @@
+import functools
+from dataclasses import dataclass, field
+from typing import NamedTuple, Tuple
+
+
+ADD = "add"
+MUL = "mul"
+
+
+class PricingStep(NamedTuple):
+    """
+    One decorator's change to the price of the coffee it wraps.
+    """
+    op: str  # ADD or MUL
+    amount: float
+
+
+@functools.lru_cache(maxsize=None)
+def shared_step(op: str, amount: float) -> PricingStep:
+    """
+    Get the PricingStep shared by every decorator with the same op and
+    amount, so cached plans do not each hold their own copies.
+    """
+    return PricingStep(op, amount)
+
+
+@dataclass(frozen=True, slots=True)
+class PricingPlan:
+    """
+    The price of a decorated coffee as a flat plan: the base price, then
+    every decorator's step from the innermost to the outermost.
+
+    Applying the steps in that order performs the same float operations as
+    the nested cost() calls, so the total is exactly the same.
+    """
+    base: float
+    steps: Tuple[PricingStep, ...]
+    total: float = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "total", self.evaluate())
+
+    def evaluate(self) -> float:
+        """
+        Apply the steps to the base price, iteratively.
+        """
+        total = self.base
+        for op, amount in self.steps:
+            if op == ADD:
+                total = total + amount
+            else:
+                total = total * amount
+        return total
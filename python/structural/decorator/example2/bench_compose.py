@@ -0,0 +1,61 @@
+"""
+compose Benchmark
+
+Compares the cost per call of log_execution, timing_decorator and
+cache_result stacked as nested wrappers and fused by compose, on cache hits
+and on a recursive fibonacci with a cleared cache. Log events are discarded
+so only the decorators' overhead is measured. Run from the repository root:
+
+    python -m python.structural.decorator.example2.bench_compose
+"""
+import argparse
+import time
+
+from python.structural.decorator.example2.decorators import (
+    cache_result,
+    compose,
+    log_execution,
+    timing_decorator,
+)
+from python.structural.decorator.example2.events import sink
+
+
+def _per_call(action, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        action(i)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--depth", type=int, default=200, help="fibonacci argument for the recursive case")
+    args = parser.parse_args()
+
+    sink.handler = lambda batch: None
+
+    @log_execution
+    @timing_decorator
+    @cache_result(maxsize=None)
+    def nested(n):
+        return n if n <= 1 else nested(n - 1) + nested(n - 2)
+
+    @compose(log_execution, timing_decorator, cache_result(maxsize=None))
+    def fused(n):
+        return n if n <= 1 else fused(n - 1) + fused(n - 2)
+
+    for name, func in (("nested", nested), ("fused", fused)):
+        hit = _per_call(lambda i: func(10), args.calls)
+
+        def recursive(i):
+            func.cache_clear()
+            func(args.depth)
+        rounds = max(1, args.calls // (10 * args.depth))
+        cold = _per_call(recursive, rounds) / (2 * args.depth - 1)
+        sink.flush()
+        print(f"{name:<8} hit={hit * 1e9:8.1f} ns/call  recursive={cold * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+validate_args Benchmark
+
+Compares the cost per call of a function validated by a hand-written
+predicate, by a validator compiled from its annotations, and by the
+compiled validator with validation switched off, against the plain function.
+Run from the repository root:
+
+    python -m python.structural.decorator.example2.bench_validate_args
+"""
+import argparse
+import time
+from typing import Annotated
+
+from python.structural.decorator.example2.decorators import validate_args
+from python.structural.decorator.example2.validation import Ge, Gt, settings
+
+
+def area(width, height, scale=1.0):
+    return width * height * scale
+
+
+def is_valid_area(width, height, scale=1.0):
+    return (isinstance(width, int) and width > 0
+            and isinstance(height, int) and height > 0
+            and isinstance(scale, (int, float)) and scale >= 0)
+
+
+@validate_args(is_valid_area)
+def predicate_area(width, height, scale=1.0):
+    return width * height * scale
+
+
+@validate_args()
+def compiled_area(width: Annotated[int, Gt(0)], height: Annotated[int, Gt(0)],
+                  scale: Annotated[float, Ge(0)] = 1.0):
+    return width * height * scale
+
+
+def _per_call(func, calls):
+    start = time.perf_counter()
+    for i in range(1, calls + 1):
+        func(i, 3, scale=2.0)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500_000)
+    args = parser.parse_args()
+
+    baseline = _per_call(area, args.calls)
+    results = [
+        ("plain", baseline),
+        ("predicate", _per_call(predicate_area, args.calls)),
+        ("compiled", _per_call(compiled_area, args.calls)),
+    ]
+    settings.enabled = False
+    results.append(("disabled", _per_call(compiled_area, args.calls)))
+    settings.enabled = True
+
+    for name, per_call in results:
+        print(f"{name:<10} {per_call * 1e9:8.1f} ns/call  "
+              f"overhead={(per_call - baseline) * 1e9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Any, List, Optional
+
+
+DiskCacheInfo = namedtuple("DiskCacheInfo", ["hits", "misses", "evictions", "currsize", "currbytes"])
+
+# Returned by DiskCache.get() when a key has no usable entry
+MISSING = object()
+
+# Keys per query in DiskCache.get_many, below SQLite's variable limit
+_QUERY_VARIABLES = 500
+
+
+class PickleSerializer:
+    """
+    The default serializer: any picklable result can be stored.
+    """
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL):
+        self.protocol = protocol
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=self.protocol)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size;
+END;
+"""
+
+
+class DiskCache:
+    """
+    A cache tier stored in a local SQLite database, shared by every process
+    on the host that opens the same path.
+
+    SQLite's write-ahead log and locking make concurrent use from several
+    processes safe. When stored results exceed max_bytes, the least
+    recently read ones are evicted. A read only records its time when the
+    entry's recorded read is at least touch_interval seconds old, so most
+    hits are pure reads and do not queue for SQLite's single writer lock;
+    eviction order is accurate to touch_interval.
+
+    Keys are digests of the pickled call key, so they should be built from
+    plain values that pickle the same way in every process.
+    """
+    def __init__(self, path, max_bytes: int = 256 * 1024 * 1024, serializer=None,
+                 timeout: float = 30.0, touch_interval: float = 60.0):
+        self._path = os.fspath(path)
+        self._max_bytes = max_bytes
+        self._touch_interval = touch_interval
+        self._serializer = serializer if serializer is not None else PickleSerializer()
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection. Connections are never shared between
+        threads, or with a child process after a fork.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def digest(namespace: str, key) -> bytes:
+        """
+        Turn a function namespace and call key into a process-independent key.
+        """
+        data = pickle.dumps(key, protocol=4)
+        return hashlib.blake2b(namespace.encode() + b"\0" + data, digest_size=20).digest()
+
+    def _count(self, hits=0, misses=0, evictions=0):
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+
+    def get(self, namespace: str, key):
+        """
+        Return the stored result for a call key, or MISSING.
+        """
+        return self.get_digest(self.digest(namespace, key))
+
+    def get_digest(self, digest: bytes):
+        """
+        Return the stored result for an already digested key, or MISSING.
+        """
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, expires, accessed FROM entries WHERE key = ?", (digest,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (row[1] is not None and row[1] <= now):
+            self._count(misses=1)
+            return MISSING
+        if now - row[2] >= self._touch_interval:
+            connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, digest))
+        self._count(hits=1)
+        return self._serializer.loads(row[0])
+
+    def get_many(self, namespace: str, keys) -> List[Any]:
+        """
+        Return the stored result or MISSING for each call key, reading them
+        in as few queries as possible.
+        """
+        digests = [self.digest(namespace, key) for key in keys]
+        connection = self._connection()
+        rows = {}
+        for start in range(0, len(digests), _QUERY_VARIABLES):
+            chunk = digests[start:start + _QUERY_VARIABLES]
+            cursor = connection.execute(
+                f"SELECT key, value, expires, accessed FROM entries WHERE key IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, value, expires, accessed in cursor:
+                rows[key] = (value, expires, accessed)
+        now = time.time()
+        results, touched = [], []
+        hits = 0
+        for digest in digests:
+            row = rows.get(digest)
+            if row is None or (row[1] is not None and row[1] <= now):
+                results.append(MISSING)
+            else:
+                results.append(self._serializer.loads(row[0]))
+                hits += 1
+                if now - row[2] >= self._touch_interval:
+                    touched.append((now, digest))
+        if touched:
+            connection.execute("BEGIN")
+            try:
+                connection.executemany("UPDATE entries SET accessed = ? WHERE key = ?", touched)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        self._count(hits=hits, misses=len(digests) - hits)
+        return results
+
+    def set(self, namespace: str, key, value, ttl: Optional[float] = None):
+        """
+        Store the result of a call, evicting old results if over max_bytes.
+        """
+        self.set_many([(self.digest(namespace, key), value)], ttl)
+
+    def set_many(self, items, ttl: Optional[float] = None):
+        """
+        Store several (digest, result) pairs in a single transaction.
+        """
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        rows = []
+        for digest, value in items:
+            data = self._serializer.dumps(value)
+            rows.append((digest, data, len(data), expires, now))
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires = excluded.expires, accessed = excluded.accessed",
+                rows,
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection):
+        """
+        Delete expired results, then the least recently read ones until the
+        stored bytes fit in max_bytes. Runs inside the write transaction.
+        """
+        evicted = connection.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+        ).rowcount
+        (excess,) = connection.execute("SELECT bytes - ? FROM usage", (self._max_bytes,)).fetchone()
+        if excess > 0:
+            victims = []
+            cursor = connection.execute("SELECT key, size FROM entries ORDER BY accessed")
+            for key, size in cursor:
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            cursor.close()
+            connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+            evicted += len(victims)
+        if evicted:
+            self._count(evictions=evicted)
+
+    def info(self) -> DiskCacheInfo:
+        """
+        Report this process's hit, miss and eviction counters along with the
+        number of entries and bytes stored by all processes.
+        """
+        connection = self._connection()
+        (count,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        (size,) = connection.execute("SELECT bytes FROM usage").fetchone()
+        with self._lock:
+            return DiskCacheInfo(self._hits, self._misses, self._evictions, count, size)
+
+    def clear(self):
+        """
+        Delete every stored result.
+        """
+        self._connection().execute("DELETE FROM entries")
+
+    def close(self):
+        """
+        Close this thread's connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
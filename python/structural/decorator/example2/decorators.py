@@ -1,90 +1,637 @@
+import asyncio
 import functools
+import inspect
+import sys
+import threading
 import time
-from typing import Callable, Any, TypeVar
+from collections import OrderedDict, namedtuple
+from typing import Callable, Any, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+
+from python.structural.decorator.example2.cache_store import DiskCache, MISSING
+from python.structural.decorator.example2.events import sink as event_sink
+from python.structural.decorator.example2.fusion import Layer, fuse, indent
+from python.structural.decorator.example2.metrics import registry as metrics
+from python.structural.decorator.example2.profiler import StackProfile, caller_stack, profile_call
+from python.structural.decorator.example2.profiler import profile as default_profile
+from python.structural.decorator.example2.resilience import Backoff, CircuitBreaker, RetryBudget
+from python.structural.decorator.example2.validation import compile_validator, settings as validation_settings
 
 
 T = TypeVar('T')
 
 
 def log_execution(func: Callable[..., T]) -> Callable[..., T]:
-    """A decorator that logs when a function starts and finishes execution."""
+    """
+    A decorator that logs when a function starts and finishes execution.
+
+    Start and finish events go to events.sink, whose background thread
+    writes them out in batches. If the sink is disabled when the decorator
+    is applied, the function is returned unchanged.
+    """
+    if not event_sink.enabled:
+        return func
+    name = func.__name__
+    emit = event_sink.emit
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> T:
+            emit({"event": "start", "function": name, "time_ns": time.time_ns()})
+            result = await func(*args, **kwargs)
+            emit({"event": "finish", "function": name, "time_ns": time.time_ns()})
+            return result
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> T:
-        print(f"LOG: Starting execution of {func.__name__}")
+        emit({"event": "start", "function": name, "time_ns": time.time_ns()})
         result = func(*args, **kwargs)
-        print(f"LOG: Finished execution of {func.__name__}")
+        emit({"event": "finish", "function": name, "time_ns": time.time_ns()})
         return result
     return wrapper
 
 
+class _LogLayer(Layer):
+    def __init__(self, func: Callable):
+        self.name = func.__name__
+
+    def bind(self, slot, namespace):
+        namespace[f"_emit{slot}"] = event_sink.emit
+        namespace[f"_name{slot}"] = self.name
+        namespace["_time_ns"] = time.time_ns
+
+    def render(self, slot, inner):
+        return [
+            f'_emit{slot}({{"event": "start", "function": _name{slot}, "time_ns": _time_ns()}})',
+            *inner,
+            f'_emit{slot}({{"event": "finish", "function": _name{slot}, "time_ns": _time_ns()}})',
+        ]
+
+
+log_execution._layer = lambda func: _LogLayer(func) if event_sink.enabled else None
+
+
 def timing_decorator(func: Callable[..., T]) -> Callable[..., T]:
-    """A decorator that measures and prints the execution time of a function."""
+    """
+    A decorator that measures the execution time of a function.
+
+    Each successful call is recorded with perf_counter_ns into the function's
+    latency histogram in metrics.registry, which reports p50/p90/p99/max.
+    While metrics.registry.enabled is False, calls are not timed at all.
+    """
+    histogram = metrics.histogram(f"{func.__module__}.{func.__qualname__}")
+    record = histogram.record
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return await func(*args, **kwargs)
+            start_time = time.perf_counter_ns()
+            result = await func(*args, **kwargs)
+            record(time.perf_counter_ns() - start_time)
+            return result
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        if not metrics.enabled:
+            return func(*args, **kwargs)
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        print(f"TIMING: {func.__name__} took {(end_time - start_time):.6f} seconds to run")
+        record(time.perf_counter_ns() - start_time)
         return result
     return wrapper
 
 
-def retry(max_attempts=3, delay_seconds=1):
+class _TimingLayer(Layer):
+    def __init__(self, func: Callable):
+        self.histogram = metrics.histogram(f"{func.__module__}.{func.__qualname__}")
+
+    def bind(self, slot, namespace):
+        namespace[f"_record{slot}"] = self.histogram.record
+        namespace["_metrics"] = metrics
+        namespace["_perf_counter_ns"] = time.perf_counter_ns
+
+    def render(self, slot, inner):
+        return [
+            f"_start{slot} = _perf_counter_ns() if _metrics.enabled else None",
+            *inner,
+            f"if _start{slot} is not None:",
+            f"    _record{slot}(_perf_counter_ns() - _start{slot})",
+        ]
+
+
+timing_decorator._layer = _TimingLayer
+
+
+def sampling_profiler(every: int = 100, *, threshold_ms: Optional[float] = None,
+                      profile: Optional[StackProfile] = None):
+    """
+    A parameterized decorator that profiles a sample of a function's calls.
+
+    Every `every`-th call runs under sys.setprofile, and the time spent in
+    the function and each of its callees is added, as collapsed stacks
+    rooted at the caller's stack, to profile (profiler.profile by default).
+    Export it with profile.collapsed() for a flame graph.
+
+    An unsampled call only increments a counter. With threshold_ms set,
+    unsampled calls are also timed, and those slower than the threshold
+    are recorded as a single stack without their callees.
+
+    Args:
+        every: Profile one call in this many
+        threshold_ms: Also record unsampled calls taking at least this long
+        profile: The StackProfile to record into
+    """
+    target = profile if profile is not None else default_profile
+    threshold_ns = int(threshold_ms * 1_000_000) if threshold_ms is not None else None
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            raise TypeError("sampling_profiler cannot profile coroutine functions")
+        name = f"{func.__module__}.{func.__qualname__}"
+        calls = 0
+        profiling = threading.local()
+
+        def sampled(args, kwargs):
+            if getattr(profiling, "active", False):
+                return func(*args, **kwargs)
+            profiling.active = True
+            try:
+                return profile_call(target, caller_stack(sys._getframe(2)), func, args, kwargs)
+            finally:
+                profiling.active = False
+
+        if threshold_ns is None:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                nonlocal calls
+                calls += 1
+                if calls < every:
+                    return func(*args, **kwargs)
+                calls = 0
+                return sampled(args, kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                nonlocal calls
+                calls += 1
+                if calls >= every:
+                    calls = 0
+                    return sampled(args, kwargs)
+                start_time = time.perf_counter_ns()
+                result = func(*args, **kwargs)
+                elapsed = time.perf_counter_ns() - start_time
+                if elapsed >= threshold_ns:
+                    stack = caller_stack(sys._getframe(1)) + [name]
+                    target.add({";".join(stack): elapsed})
+                return result
+
+        wrapper.profile = target
+        return wrapper
+    return decorator
+
+
+def retry(max_attempts=3, delay_seconds=1, *, backoff: float = 1.0,
+          max_delay: Optional[float] = None, jitter: Optional[str] = None,
+          retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+          budget: Optional[RetryBudget] = None,
+          circuit_breaker: Optional[CircuitBreaker] = None):
     """
     A parameterized decorator that retries a function if it raises an exception.
+    Coroutine functions are retried with asyncio.sleep, so the event loop keeps running.
 
     Args:
         max_attempts: Maximum number of attempts before giving up
-        delay_seconds: Seconds to wait between attempts
+        delay_seconds: Seconds to wait before the first retry
+        backoff: Factor the delay grows by after every retry
+        max_delay: Upper bound for a single delay
+        jitter: None, "full" or "decorrelated"; see Backoff
+        retry_on: Exception types worth retrying; others are raised at once
+        budget: A RetryBudget shared with other calls; when it is empty,
+                the last error is raised instead of retrying
+        circuit_breaker: A CircuitBreaker for the dependency; while it is
+                         open, calls fail fast with CircuitOpenError. Errors
+                         in retry_on count as failures of the dependency,
+                         returns as successes; other errors, cancellation
+                         and interrupts count as neither
     """
+    delays = Backoff(delay_seconds, backoff, max_delay, jitter)
+
+    def before_attempt():
+        if circuit_breaker is not None:
+            circuit_breaker.before_call()
+
+    def after_success():
+        if circuit_breaker is not None:
+            circuit_breaker.record_success()
+
+    def after_abandoned():
+        if circuit_breaker is not None:
+            circuit_breaker.record_abandoned()
+
+    def after_failure(error, attempts, pending_delays):
+        """Return the delay before the next attempt, or None to give up."""
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        if attempts >= max_attempts or (budget is not None and not budget.try_acquire()):
+            return None
+        delay = next(pending_delays)
+        print(f"RETRY: Attempt {attempts} failed with error: {error}. Retrying in {delay:g} seconds...")
+        return delay
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                pending_delays = delays.delays()
+                attempts = 0
+                while True:
+                    before_attempt()
+                    try:
+                        result = await func(*args, **kwargs)
+                    except retry_on as e:
+                        attempts += 1
+                        delay = after_failure(e, attempts, pending_delays)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                    except BaseException:
+                        # Not retryable, cancelled or interrupted: no verdict
+                        # on the dependency
+                        after_abandoned()
+                        raise
+                    else:
+                        after_success()
+                        return result
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            pending_delays = delays.delays()
             attempts = 0
-            while attempts < max_attempts:
+            while True:
+                before_attempt()
                 try:
-                    return func(*args, **kwargs)
-                except Exception as e:
+                    result = func(*args, **kwargs)
+                except retry_on as e:
                     attempts += 1
-                    if attempts == max_attempts:
+                    delay = after_failure(e, attempts, pending_delays)
+                    if delay is None:
                         raise
-                    print(f"RETRY: Attempt {attempts} failed with error: {e}. Retrying in {delay_seconds} seconds...")
-                    time.sleep(delay_seconds)
+                    time.sleep(delay)
+                except BaseException:
+                    # Not retryable, cancelled or interrupted: no verdict
+                    # on the dependency
+                    after_abandoned()
+                    raise
+                else:
+                    after_success()
+                    return result
         return wrapper
     return decorator
 
 
-def cache_result(func: Callable[..., T]) -> Callable[..., T]:
-    """A decorator that caches the results of a function call to avoid repeated computation."""
-    cache = {}
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
 
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Create a key from the function arguments
-        # Note: This simple implementation only works for hashable arguments
-        key = str(args) + str(kwargs)
-        if key not in cache:
-            print(f"CACHE: Computing result for {func.__name__}{args}")
-            cache[key] = func(*args, **kwargs)
-        else:
-            print(f"CACHE: Using cached result for {func.__name__}{args}")
-        return cache[key]
+# Separates positional from keyword arguments in cache keys
+_KWD_MARK = object()
 
-    return wrapper
 
+def _make_key(args: tuple, kwargs: dict, typed: bool):
+    """
+    Build a hashable cache key from call arguments.
 
-def validate_args(validator_func: Callable):
+    With typed=True, arguments that compare equal but have different types,
+    such as 1, 1.0 and True, are cached separately.
+    """
+    key = args
+    if kwargs:
+        key += (_KWD_MARK,) + tuple(kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    elif len(key) == 1 and type(key[0]) in (int, str):
+        return key[0]
+    return key
+
+
+class _ResultCache:
+    """
+    A thread-safe LRU cache with optional time-to-live, used by cache_result.
+    """
+    def __init__(self, maxsize: Optional[int], ttl: Optional[float]):
+        self._entries = OrderedDict()  # key -> (result, expiry time or None)
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Return the cached result for key, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return result
+                del self._entries[key]
+                self._evictions += 1
+            self._misses += 1
+            return MISSING
+
+    def get_many(self, keys: List[Any]) -> List[Any]:
+        """Return the cached result or MISSING for each key, under a single lock."""
+        now = time.monotonic()
+        results = []
+        hits = 0
+        with self._lock:
+            entries = self._entries
+            for key in keys:
+                entry = entries.get(key)
+                if entry is not None:
+                    result, expires = entry
+                    if expires is None or expires > now:
+                        entries.move_to_end(key)
+                        hits += 1
+                        results.append(result)
+                        continue
+                    del entries[key]
+                    self._evictions += 1
+                results.append(MISSING)
+            self._hits += hits
+            self._misses += len(keys) - hits
+        return results
+
+    def set(self, key, result):
+        """Store a result, evicting the least recently used entries if full."""
+        if self._maxsize == 0:
+            return
+        expires = time.monotonic() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            self._entries[key] = (result, expires)
+            self._entries.move_to_end(key)
+            if self._maxsize is not None:
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+    def set_many(self, items: List[Tuple[Any, Any]]):
+        """Store several (key, result) pairs under a single lock."""
+        if self._maxsize == 0 or not items:
+            return
+        expires = time.monotonic() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            entries = self._entries
+            for key, result in items:
+                entries[key] = (result, expires)
+                entries.move_to_end(key)
+            if self._maxsize is not None:
+                while len(entries) > self._maxsize:
+                    entries.popitem(last=False)
+                    self._evictions += 1
+
+    def info(self) -> CacheInfo:
+        """Report the cache's hit, miss and eviction counters."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self._maxsize, len(self._entries))
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+def cache_result(func: Callable[..., T] = None, *, maxsize: Optional[int] = 128,
+                 ttl: Optional[float] = None, typed: bool = False,
+                 disk: Optional[DiskCache] = None,
+                 promote: Union[bool, Callable[[Any], bool]] = True):
+    """
+    A decorator that caches the results of a function call to avoid repeated computation.
+
+    Can be applied bare (@cache_result) or with options. Arguments must be hashable.
+
+    Args:
+        maxsize: Maximum number of cached results; least recently used results
+                 are evicted first. None means unbounded.
+        ttl: Seconds after which a cached result expires. None means never.
+        typed: Cache arguments of different types separately, e.g. 1 and 1.0.
+        disk: A DiskCache used as a second tier, shared by every process on
+              the host. Memory misses are looked up there before computing,
+              and computed results are stored in both tiers.
+        promote: Whether results found on disk are copied into memory. Either
+                 a bool or a predicate called with the result.
+
+    The wrapper exposes cache_info() and cache_clear(). cache_clear() only
+    clears the memory tier. Wrappers of regular functions also expose
+    batch(items, compute=None), which resolves many calls at once.
+
+    Coroutine functions are cached by result, not by coroutine object, and
+    concurrent calls with the same key share a single in-flight computation
+    instead of each calling the function (single-flight). The computation
+    runs in its own task, so a cancelled caller leaves it running for the
+    others, and its result is cached even if every caller was cancelled.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        layer = _CacheLayer(func, maxsize, ttl, typed, disk, promote)
+        cache, namespace, load = layer.cache, layer.namespace, layer.load
+
+        if inspect.iscoroutinefunction(func):
+            in_flight = {}
+
+            async def compute(key, args, kwargs):
+                """Compute a missing result; runs as the task shared by every caller of the key."""
+                loop = asyncio.get_running_loop()
+                try:
+                    result = MISSING
+                    if disk is not None:
+                        result = await loop.run_in_executor(None, load, key)
+                    if result is MISSING:
+                        result = await func(*args, **kwargs)
+                        cache.set(key, result)
+                        if disk is not None:
+                            await loop.run_in_executor(None, disk.set, namespace, key, result, ttl)
+                    return result
+                finally:
+                    del in_flight[key]
+
+            def retrieve(task):
+                # Callers re-raise a failure; this only silences the
+                # "exception was never retrieved" warning when all of them left
+                if not task.cancelled():
+                    task.exception()
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = _make_key(args, kwargs, typed)
+                result = cache.get(key)
+                if result is not MISSING:
+                    return result
+                task = in_flight.get(key)
+                if task is None:
+                    task = in_flight[key] = asyncio.ensure_future(compute(key, args, kwargs))
+                    task.add_done_callback(retrieve)
+                # Cancelling one caller must not cancel the computation the others wait for
+                return await asyncio.shield(task)
+
+            async_wrapper.cache_info = cache.info
+            async_wrapper.cache_clear = cache.clear
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed)
+            result = cache.get(key)
+            if result is not MISSING:
+                return result
+            if disk is not None:
+                result = load(key)
+                if result is not MISSING:
+                    return result
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+            if disk is not None:
+                disk.set(namespace, key, result, ttl)
+            return result
+
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        wrapper.batch = layer.batch
+        return wrapper
+
+    decorator._layer = lambda func: _CacheLayer(func, maxsize, ttl, typed, disk, promote)
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+class _CacheLayer(Layer):
+    def __init__(self, func: Callable, maxsize: Optional[int] = 128, ttl: Optional[float] = None,
+                 typed: bool = False, disk: Optional[DiskCache] = None,
+                 promote: Union[bool, Callable[[Any], bool]] = True):
+        self.func = func
+        self.cache = _ResultCache(maxsize, ttl)
+        self.namespace = f"{func.__module__}.{func.__qualname__}"
+        self.ttl = ttl
+        self.typed = typed
+        self.disk = disk
+        self.should_promote = promote if callable(promote) else (lambda result: promote)
+
+    def load(self, key):
+        """Look a memory miss up in the disk tier."""
+        result = self.disk.get(self.namespace, key)
+        if result is not MISSING and self.should_promote(result):
+            self.cache.set(key, result)
+        return result
+
+    def batch(self, items: Iterable[tuple], compute: Optional[Callable[[List[tuple]], Iterable]] = None) -> list:
+        """
+        Get the results for many calls, each given as a tuple of positional
+        arguments, in order.
+
+        All keys are looked up in memory in one pass, then the misses in the
+        disk tier in one query. Distinct remaining calls are computed with a
+        single call to compute(list of argument tuples), which returns their
+        results in order, or else by calling the function for each. New
+        results are stored in bulk.
+        """
+        calls = [tuple(args) for args in items]
+        keys = [_make_key(args, {}, self.typed) for args in calls]
+        results = self.cache.get_many(keys)
+        missing = {}  # key -> index of its first call
+        for index, result in enumerate(results):
+            if result is MISSING and keys[index] not in missing:
+                missing[keys[index]] = index
+        if not missing:
+            return results
+
+        resolved = {}
+        if self.disk is not None:
+            promoted = []
+            for key, result in zip(list(missing), self.disk.get_many(self.namespace, list(missing))):
+                if result is not MISSING:
+                    del missing[key]
+                    resolved[key] = result
+                    if self.should_promote(result):
+                        promoted.append((key, result))
+            self.cache.set_many(promoted)
+        if missing:
+            pending = [calls[index] for index in missing.values()]
+            if compute is not None:
+                computed = list(compute(pending))
+                if len(computed) != len(pending):
+                    raise ValueError(f"compute returned {len(computed)} results for {len(pending)} calls")
+            else:
+                computed = [self.func(*args) for args in pending]
+            new = list(zip(missing, computed))
+            self.cache.set_many(new)
+            if self.disk is not None:
+                self.disk.set_many([(self.disk.digest(self.namespace, key), result) for key, result in new], self.ttl)
+            resolved.update(new)
+        for index, result in enumerate(results):
+            if result is MISSING:
+                results[index] = resolved[keys[index]]
+        return results
+
+    def bind(self, slot, namespace):
+        namespace["_make_key"] = _make_key
+        namespace["_MISSING"] = MISSING
+        namespace[f"_typed{slot}"] = self.typed
+        namespace[f"_get{slot}"] = self.cache.get
+        namespace[f"_set{slot}"] = self.cache.set
+        if self.disk is not None:
+            namespace[f"_load{slot}"] = self.load
+            namespace[f"_disk_set{slot}"] = self.disk.set
+            namespace[f"_namespace{slot}"] = self.namespace
+            namespace[f"_ttl{slot}"] = self.ttl
+
+    def render(self, slot, inner):
+        compute = [*inner, f"_set{slot}(_key{slot}, result)"]
+        if self.disk is not None:
+            compute.append(f"_disk_set{slot}(_namespace{slot}, _key{slot}, result, _ttl{slot})")
+            compute = [f"result = _load{slot}(_key{slot})", "if result is _MISSING:", *indent(compute)]
+        return [
+            f"_key{slot} = _make_key(args, kwargs, _typed{slot})",
+            f"result = _get{slot}(_key{slot})",
+            "if result is _MISSING:",
+            *indent(compute),
+        ]
+
+    def attributes(self):
+        return {"cache_info": self.cache.info, "cache_clear": self.cache.clear, "batch": self.batch}
+
+
+cache_result._layer = _CacheLayer
+
+
+def validate_args(validator_func: Optional[Callable] = None):
     """
     A decorator that validates function arguments.
 
     Args:
         validator_func: A function that takes the same arguments as the decorated function
                        and returns True if the arguments are valid, False otherwise.
+                       If omitted, the arguments are checked against the function's
+                       annotations, including Annotated constraints such as
+                       Annotated[int, Gt(0)], by a validator compiled once at decoration time.
+
+    Setting validation.settings.enabled to False skips validation in both modes.
     """
     def decorator(func):
+        if validator_func is None:
+            return compile_validator(func)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            if not validator_func(*args, **kwargs):
+            if validation_settings.enabled and not validator_func(*args, **kwargs):
                 raise ValueError(f"Invalid arguments for {func.__name__}")
             return func(*args, **kwargs)
         return wrapper
@@ -95,18 +642,70 @@ def deprecated(message: str = "This function is deprecated"):
     """
     Mark a function as deprecated with a custom message.
 
+    The warning is sent to events.sink once per call site (the file and line
+    of the direct caller), not on every call. If the sink is disabled when
+    the decorator is applied, the function is returned unchanged.
+
     Args:
         message: The deprecation message to display
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if not event_sink.enabled:
+            return func
+        warned_sites = set()
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            print(f"WARNING: {message}")
+            caller = sys._getframe(1)
+            site = (caller.f_code.co_filename, caller.f_lineno)
+            if site not in warned_sites:
+                warned_sites.add(site)
+                event_sink.emit({
+                    "event": "deprecated",
+                    "function": func.__name__,
+                    "message": message,
+                    "filename": site[0],
+                    "lineno": site[1],
+                })
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
+def compose(*decorators):
+    """
+    Apply several decorators at once, listed outermost first like a stack
+    of @ lines, fusing log_execution, timing_decorator and cache_result
+    into a single generated wrapper.
+
+    @compose(log_execution, timing_decorator, cache_result) behaves like the
+    three stacked decorators, but each call goes through one frame and packs
+    its arguments once. Other decorators are applied as usual, splitting the
+    fused runs around them. Coroutine functions are decorated without fusion.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            for outer in reversed(decorators):
+                func = outer(func)
+            return func
+        layers = []
+        for outer in reversed(decorators):
+            make_layer = getattr(outer, "_layer", None)
+            if make_layer is None:
+                if layers:
+                    func = fuse(func, layers[::-1])
+                    layers = []
+                func = outer(func)
+                continue
+            layer = make_layer(func)
+            if layer is not None:
+                layers.append(layer)
+        if layers:
+            func = fuse(func, layers[::-1])
+        return func
+    return decorator
+
+
 # Class decorator example
 def singleton(cls):
     """A decorator that ensures a class has only one instance."""
@@ -0,0 +1,100 @@
+import atexit
+import json
+import queue
+import sys
+import threading
+from typing import Callable, Dict, List
+
+
+Event = Dict[str, object]
+
+_MESSAGES = {
+    "start": "LOG: Starting execution of {function}",
+    "finish": "LOG: Finished execution of {function}",
+    "deprecated": "WARNING: {message} (called from {filename}:{lineno})",
+}
+
+
+def format_event(event: Event) -> str:
+    """Render an event as the line the decorators used to print."""
+    template = _MESSAGES.get(event.get("event"))
+    if template is None:
+        return json.dumps(event, default=str)
+    return template.format(**event)
+
+
+def print_events(events: List[Event]):
+    """The default handler: write a batch of events to stdout in one go."""
+    sys.stdout.write("".join(format_event(event) + "\n" for event in events))
+    sys.stdout.flush()
+
+
+class _FlushMarker:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class EventSink:
+    """
+    Collects structured events from decorated functions and hands them to a
+    handler in batches from a background thread, so the calling thread only
+    pays for putting a dict on a queue.
+
+    enabled is read by decorators when they are applied: decorating while it
+    is False returns the function unchanged, without a wrapper. handler can
+    be replaced at any time.
+    """
+    def __init__(self, handler: Callable[[List[Event]], None] = print_events,
+                 batch_size: int = 256, enabled: bool = True):
+        self.enabled = enabled
+        self.handler = handler
+        self._batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def emit(self, event: Event):
+        """Queue an event for the background thread."""
+        if self._thread is None:
+            self._start()
+        self._queue.put(event)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._drain, name="event-sink", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _drain(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [item for item in batch if not isinstance(item, _FlushMarker)]
+            if events:
+                try:
+                    self.handler(events)
+                except Exception as e:
+                    sys.stderr.write(f"EventSink handler failed: {e!r}\n")
+            for item in batch:
+                if isinstance(item, _FlushMarker):
+                    item.done.set()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every event emitted so far has been handled.
+        """
+        if self._thread is None:
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+
+# The sink log_execution and deprecated send their events to
+sink = EventSink()
+atexit.register(sink.flush, 5.0)
@@ -0,0 +1,51 @@
+import functools
+from typing import Callable, List
+
+
+class Layer:
+    """
+    One decorator's behaviour, expressed as source lines around the call to
+    the next layer, so several decorators can be generated into one wrapper.
+
+    The generated wrapper takes (*args, **kwargs), passes the result down
+    in a local variable named result and returns it at the end. Layers must
+    not return early; a layer that skips the call (a cache hit) leaves
+    result set and lets the outer layers finish.
+    """
+    def bind(self, slot: str, namespace: dict):
+        """Add the objects the layer's source refers to, with names ending in slot."""
+        pass
+
+    def render(self, slot: str, inner: List[str]) -> List[str]:
+        """Get the layer's source lines around the inner lines."""
+        return inner
+
+    def attributes(self) -> dict:
+        """Get the attributes the layer's decorator sets on its wrapper."""
+        return {}
+
+
+def indent(lines: List[str]) -> List[str]:
+    return ["    " + line for line in lines]
+
+
+def fuse(func: Callable, layers: List[Layer]) -> Callable:
+    """
+    Generate a single wrapper for func applying layers, outermost first.
+
+    This behaves like nesting the decorators, but a call goes through one
+    frame and packs its arguments once.
+    """
+    namespace = {"_func": func}
+    lines = ["result = _func(*args, **kwargs)"]
+    for index, layer in reversed(list(enumerate(layers))):
+        layer.bind(str(index), namespace)
+        lines = layer.render(str(index), lines)
+    # A fixed name: func.__name__ may not be an identifier (a lambda) or may
+    # shadow _func or a layer's names; update_wrapper copies func's names over
+    source = "\n".join(["def _fused_wrapper(*args, **kwargs):", *indent(lines), "    return result", ""])
+    exec(compile(source, f"<fused wrapper for {func.__qualname__}>", "exec"), namespace)
+    wrapper = functools.update_wrapper(namespace["_fused_wrapper"], func)
+    for layer in reversed(layers):
+        wrapper.__dict__.update(layer.attributes())
+    return wrapper
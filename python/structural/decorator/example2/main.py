@@ -1,12 +1,20 @@
+from typing import Annotated
+
 from python.structural.decorator.example2.decorators import (
     log_execution,
     timing_decorator,
     cache_result,
+    compose,
     deprecated,
     validate_args,
     retry,
+    sampling_profiler,
     singleton,
 )
+from python.structural.decorator.example2.events import sink as event_sink
+from python.structural.decorator.example2.metrics import registry as metrics
+from python.structural.decorator.example2.profiler import profile
+from python.structural.decorator.example2.validation import Ge
 
 
 # Define validator functions
@@ -17,10 +25,8 @@ def are_positive_integers(*args):
     return all(isinstance(arg, int) and arg > 0 for arg in args)
 
 
-# Apply multiple decorators
-@log_execution
-@timing_decorator
-@cache_result
+# Apply multiple decorators, fused into a single wrapper
+@compose(log_execution, timing_decorator, cache_result)
 def fibonacci(n):
     """Calculate the nth Fibonacci number recursively."""
     if n <= 1:
@@ -37,6 +43,23 @@ def factorial(n):
     return n * factorial(n-1)
 
 
+@validate_args()
+def binomial(n: Annotated[int, Ge(0)], k: Annotated[int, Ge(0)]):
+    """Count the ways to choose k items out of n; checked against the annotations."""
+    if k > n:
+        return 0
+    result = 1
+    for i in range(1, k + 1):
+        result = result * (n - k + i) // i
+    return result
+
+
+@sampling_profiler(every=10)
+def checksum(data):
+    """Checksum a block of bytes; one call in ten is profiled."""
+    return sum(sorted(data)) % 255
+
+
 @retry(max_attempts=3)
 def unreliable_network_call(url):
     """Simulate an unreliable network call that might fail."""
@@ -59,17 +82,46 @@ class DatabaseConnection:
 
 def run_examples():
     """Run examples demonstrating Python decorators."""
+    # Log events are written by a background thread, so the sink is flushed
+    # before each result is printed to keep the output in order
     print("\n--- Fibonacci with caching ---")
-    print(f"fibonacci(10) = {fibonacci(10)}")
-    print(f"fibonacci(10) again = {fibonacci(10)}")  # Should use cached result
+    result = fibonacci(10)
+    event_sink.flush()
+    print(f"fibonacci(10) = {result}")
+    result = fibonacci(10)  # Should use cached result
+    event_sink.flush()
+    print(f"fibonacci(10) again = {result}")
+    batch = fibonacci.batch([(n,) for n in range(5, 13)])  # Only 11 and 12 are computed
+    event_sink.flush()
+    print(f"fibonacci.batch for 5..12 = {batch}")
+    print(f"Cache statistics: {fibonacci.cache_info()}")
+    print(f"Timing statistics: {metrics.to_text()}")
 
     print("\n--- Factorial with validation ---")
     try:
-        print(f"factorial(5) = {factorial(5)}")
-        print(f"factorial(-1) = {factorial(-1)}")  # Should raise ValueError
+        result = factorial(5)
+        event_sink.flush()
+        print(f"factorial(5) = {result}")
+        result = factorial(-1)  # Should raise ValueError
+        event_sink.flush()
+        print(f"factorial(-1) = {result}")
     except ValueError as e:
+        event_sink.flush()
         print(f"Caught error: {e}")
 
+    print("\n--- Validation compiled from annotations ---")
+    try:
+        print(f"binomial(10, 3) = {binomial(10, 3)}")
+        print(f"binomial(10, -3) = {binomial(10, -3)}")  # Should raise ValueError
+    except ValueError as e:
+        print(f"Caught error: {e}")
+
+    print("\n--- Sampling profiler ---")
+    for i in range(100):
+        checksum(bytes(range(i, 256)))
+    print(f"Profiled {profile.samples} of 100 calls; collapsed stacks for a flame graph:")
+    print(profile.collapsed(), end="")
+
     print("\n--- Retry decorator ---")
     try:
         result = unreliable_network_call("https://example.com/api")
@@ -0,0 +1,146 @@
+import json
+import threading
+from typing import Dict
+
+
+# Each power of two is split into 2 ** _SUB_BITS linear sub-buckets, so a
+# recorded value is off by at most 1 / 2 ** _SUB_BITS (about 6%)
+_SUB_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BITS
+# Enough buckets for any 64-bit nanosecond value
+_BUCKETS = (64 - _SUB_BITS) * _SUB_BUCKETS + 2 * _SUB_BUCKETS
+
+
+def _bucket_index(value: int) -> int:
+    shift = value.bit_length() - _SUB_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << _SUB_BITS) + (value >> shift)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift = (index >> _SUB_BITS) - 1
+    return ((index - (shift << _SUB_BITS) + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    A log-linear histogram of latencies in nanoseconds.
+
+    Recording is a bucket computation and a few unlocked increments. Under
+    heavy thread contention an occasional count can be lost, which is an
+    accepted trade-off for keeping locks off the hot path.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._counts = [0] * _BUCKETS
+        self._count = 0
+        self._sum = 0
+        self._max = 0
+
+    def record(self, nanoseconds: int):
+        """Record one latency."""
+        self._counts[_bucket_index(nanoseconds)] += 1
+        self._count += 1
+        self._sum += nanoseconds
+        if nanoseconds > self._max:
+            self._max = nanoseconds
+
+    @property
+    def count(self) -> int:
+        """Get the number of recorded latencies."""
+        return self._count
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Get an upper bound for the given percentile, e.g. 0.99 for p99.
+        """
+        if not self._count:
+            return 0
+        rank = fraction * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= rank:
+                return min(_bucket_upper_bound(index), self._max)
+        return self._max
+
+    def summary(self) -> Dict[str, int]:
+        """Get count, total, p50, p90, p99 and max in nanoseconds."""
+        return {
+            "count": self._count,
+            "sum_ns": self._sum,
+            "p50_ns": self.percentile(0.50),
+            "p90_ns": self.percentile(0.90),
+            "p99_ns": self.percentile(0.99),
+            "max_ns": self._max,
+        }
+
+    def reset(self):
+        """Forget every recorded latency."""
+        self._counts = [0] * _BUCKETS
+        self._count = 0
+        self._sum = 0
+        self._max = 0
+
+
+def _format_ns(nanoseconds: int) -> str:
+    for unit, scale in (("s", 10 ** 9), ("ms", 10 ** 6), ("us", 10 ** 3)):
+        if nanoseconds >= scale:
+            return f"{nanoseconds / scale:.3g}{unit}"
+    return f"{nanoseconds}ns"
+
+
+class MetricsRegistry:
+    """
+    Holds one latency histogram per name and exports them as text or JSON.
+
+    Setting enabled to False turns recording off everywhere; instrumented
+    functions then only pay for checking the flag.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Get the histogram for a name, creating it on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(name))
+        return histogram
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Get the summary of every histogram that recorded anything."""
+        return {
+            name: histogram.summary()
+            for name, histogram in list(self._histograms.items())
+            if histogram.count
+        }
+
+    def to_json(self) -> str:
+        """Export the summaries as a JSON object keyed by name."""
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_text(self) -> str:
+        """Export the summaries as one human-readable line per name."""
+        lines = []
+        for name, summary in sorted(self.snapshot().items()):
+            lines.append(
+                f"{name} count={summary['count']} p50={_format_ns(summary['p50_ns'])} "
+                f"p90={_format_ns(summary['p90_ns'])} p99={_format_ns(summary['p99_ns'])} "
+                f"max={_format_ns(summary['max_ns'])}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """Clear every histogram."""
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+
+
+# The registry timing_decorator records into
+registry = MetricsRegistry()
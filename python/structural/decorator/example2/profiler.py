@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+from typing import Dict, List, TextIO
+
+
+# Frames above the profiled function kept as the root of its stacks
+_CALLER_DEPTH = 32
+_OTHER = "[other]"
+
+
+def frame_name(frame) -> str:
+    """Name a Python frame as module.qualname."""
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+
+
+def builtin_name(function) -> str:
+    """Name a C function as module.qualname."""
+    module = getattr(function, "__module__", None) or "builtins"
+    return f"{module}.{getattr(function, '__qualname__', repr(function))}"
+
+
+def caller_stack(frame, depth: int = _CALLER_DEPTH) -> List[str]:
+    """Get the names of frame and its callers, outermost first."""
+    names = []
+    while frame is not None and len(names) < depth:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+class StackProfile:
+    """
+    Nanoseconds spent per call stack, kept as collapsed stacks
+    ("outer;inner;leaf"), the input format of flame graph tools.
+
+    At most max_stacks distinct stacks are kept; time in further stacks is
+    added to "<root>;[other]" so totals stay right while memory is bounded.
+    """
+    def __init__(self, max_stacks: int = 10_000):
+        self.max_stacks = max_stacks
+        self._stacks: Dict[str, int] = {}
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def add(self, samples: Dict[str, int]):
+        """Merge the self time per stack of one sampled call."""
+        with self._lock:
+            self._samples += 1
+            stacks = self._stacks
+            for stack, nanoseconds in samples.items():
+                if stack not in stacks and len(stacks) >= self.max_stacks:
+                    stack = stack.split(";", 1)[0] + ";" + _OTHER
+                stacks[stack] = stacks.get(stack, 0) + nanoseconds
+
+    @property
+    def samples(self) -> int:
+        """Get the number of calls profiled."""
+        return self._samples
+
+    def collapsed(self) -> str:
+        """
+        Export one "stack nanoseconds" line per stack, for flamegraph.pl,
+        speedscope or inferno.
+        """
+        with self._lock:
+            items = sorted(self._stacks.items())
+        return "".join(f"{stack} {nanoseconds}\n" for stack, nanoseconds in items)
+
+    def write(self, file: TextIO):
+        """Write the collapsed stacks to an open text file."""
+        file.write(self.collapsed())
+
+    def clear(self):
+        """Forget every sample."""
+        with self._lock:
+            self._stacks = {}
+            self._samples = 0
+
+
+class _CallRecorder:
+    """
+    A sys.setprofile callback timing every call made while it is installed.
+    """
+    def __init__(self, root: List[str]):
+        self.samples: Dict[str, int] = {}
+        # One [path, started, time in callees] entry per open call
+        self._open = [[";".join(root), time.perf_counter_ns(), 0]]
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if event == "call":
+            self._open.append([self._open[-1][0] + ";" + frame_name(frame), now, 0])
+        elif event == "c_call":
+            if arg is sys.setprofile:
+                return
+            self._open.append([self._open[-1][0] + ";" + builtin_name(arg), now, 0])
+        elif event in ("return", "c_return", "c_exception") and len(self._open) > 1:
+            self._close(now)
+
+    def _close(self, now: int):
+        path, started, in_callees = self._open.pop()
+        elapsed = now - started
+        self.samples[path] = self.samples.get(path, 0) + elapsed - in_callees
+        self._open[-1][2] += elapsed
+
+    def finish(self) -> Dict[str, int]:
+        """Close every open call and get the self time per stack."""
+        now = time.perf_counter_ns()
+        while len(self._open) > 1:
+            self._close(now)
+        path, started, in_callees = self._open[0]
+        self.samples[path] = self.samples.get(path, 0) + now - started - in_callees
+        return self.samples
+
+
+def profile_call(profile: StackProfile, root: List[str], func, args, kwargs):
+    """
+    Call func under sys.setprofile and add the time spent in it and its
+    callees to profile, below the root stack.
+    """
+    recorder = _CallRecorder(root)
+    previous = sys.getprofile()
+    sys.setprofile(recorder)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sys.setprofile(previous)
+        profile.add(recorder.finish())
+
+
+# The profile sampling_profiler records into unless given another one
+profile = StackProfile()
@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+from enum import Enum
+from typing import Iterator, Optional
+
+
+class Backoff:
+    """
+    Computes the delays between retry attempts.
+
+    The n-th delay is delay * multiplier ** (n - 1), capped at max_delay.
+    Jitter spreads retries of many clients apart:
+    - None: no jitter, the delays are exactly the computed ones
+    - "full": a random delay between 0 and the computed one
+    - "decorrelated": a random delay between delay and three times the
+      previous delay, capped at max_delay
+    """
+    JITTERS = (None, "full", "decorrelated")
+
+    def __init__(self, delay: float = 1.0, multiplier: float = 1.0,
+                 max_delay: Optional[float] = None, jitter: Optional[str] = None):
+        if jitter not in self.JITTERS:
+            raise ValueError(f"Unknown jitter {jitter!r}, expected one of {self.JITTERS}")
+        self.delay = delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay if max_delay is not None else float("inf")
+        self.jitter = jitter
+
+    def delays(self) -> Iterator[float]:
+        """Yield the delays of one call's retries."""
+        computed = self.delay
+        previous = self.delay
+        while True:
+            capped = min(computed, self.max_delay)
+            if self.jitter == "full":
+                yield random.uniform(0, capped)
+            elif self.jitter == "decorrelated":
+                previous = min(self.max_delay, random.uniform(self.delay, previous * 3))
+                yield previous
+            else:
+                yield capped
+            computed *= self.multiplier
+
+
+class RetryBudget:
+    """
+    A token bucket shared by every call that retries the same dependency.
+
+    Each retry takes a token, and tokens come back at `rate` per second up
+    to `capacity`. During an outage the bucket runs dry, so failing calls
+    give up instead of multiplying the load on the dependency.
+    """
+    def __init__(self, rate: float = 10.0, capacity: float = 20.0, clock=time.monotonic):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        """Get the number of tokens left at the last update."""
+        return self._tokens
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling a dependency while its circuit is open.
+    """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency that keeps failing.
+
+    - closed: calls go through; failure_threshold consecutive failures open
+      the circuit
+    - open: calls fail fast with CircuitOpenError until reset_timeout seconds
+      have passed, then the circuit becomes half-open
+    - half-open: up to half_open_calls trial calls go through; a success
+      closes the circuit and a failure opens it again
+
+    Results of calls admitted before the circuit opened, arriving while it
+    is open, are ignored: a late success does not close it early.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_calls: int = 1, clock=time.monotonic):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Get the current state, moving from open to half-open when due."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if (self._state is CircuitState.OPEN
+                and self._clock() - self._opened_at >= self._reset_timeout):
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError if the call must not reach the dependency.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state is CircuitState.OPEN:
+                raise CircuitOpenError("Circuit is open; failing fast")
+            if self._state is CircuitState.HALF_OPEN:
+                if self._trials >= self._half_open_calls:
+                    raise CircuitOpenError("Circuit is half-open; trial call in progress")
+                self._trials += 1
+
+    def record_success(self):
+        """Record that the dependency answered."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+                self._failures = 0
+            elif self._state is CircuitState.CLOSED:
+                self._failures = 0
+
+    def record_abandoned(self):
+        """
+        Record that a call ended without an answer from the dependency, e.g.
+        it was cancelled or interrupted, freeing its half-open trial slot.
+        """
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_failure(self):
+        """Record that the dependency failed."""
+        with self._lock:
+            if self._state is CircuitState.OPEN:
+                return
+            self._failures += 1
+            if (self._state is CircuitState.HALF_OPEN
+                    or self._failures >= self._failure_threshold):
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._failures = 0
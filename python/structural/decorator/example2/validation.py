@@ -0,0 +1,202 @@
+import functools
+import inspect
+import types
+import typing
+from typing import Any, Callable
+
+
+class ValidationSettings:
+    """
+    Global switch for argument validation. Trusted hot paths can set
+    enabled to False; validated calls then only check this flag.
+    """
+    def __init__(self):
+        self.enabled = True
+
+
+settings = ValidationSettings()
+
+
+class Constraint:
+    """
+    Constraint metadata for typing.Annotated, e.g. Annotated[int, Gt(0)].
+
+    Subclasses describe their check as a Python expression, so it can be
+    compiled straight into the generated validator.
+    """
+    template = ""
+
+    def __init__(self, value):
+        self.value = value
+
+    def source(self, name: str, ref: str) -> str:
+        """Get the check for argument `name`, with the constraint value bound to `ref`."""
+        return self.template.format(name=name, ref=ref)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.value!r})"
+
+
+class Gt(Constraint):
+    template = "{name} > {ref}"
+
+
+class Ge(Constraint):
+    template = "{name} >= {ref}"
+
+
+class Lt(Constraint):
+    template = "{name} < {ref}"
+
+
+class Le(Constraint):
+    template = "{name} <= {ref}"
+
+
+class MinLen(Constraint):
+    template = "len({name}) >= {ref}"
+
+
+class MaxLen(Constraint):
+    template = "len({name}) <= {ref}"
+
+
+class Predicate(Constraint):
+    """A custom check: Predicate(callable) passes when callable(value) is true."""
+    template = "{ref}({name})"
+
+
+_NUMERIC_TOWER = {float: (float, int), complex: (complex, float, int)}
+
+
+def _runtime_types(annotation):
+    """
+    Get the classes isinstance() can check for an annotation, or None if it
+    cannot be checked (Any, type variables, unsupported typing forms).
+    """
+    if annotation is Any or annotation is inspect.Parameter.empty:
+        return None
+    if isinstance(annotation, type):
+        # int is accepted where float or complex is expected, as in PEP 484
+        return _NUMERIC_TOWER.get(annotation, (annotation,))
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is types.UnionType:
+        classes = []
+        for arg in typing.get_args(annotation):
+            arg_types = _runtime_types(arg)
+            if arg_types is None:
+                return None
+            classes.extend(arg_types)
+        return tuple(classes)
+    if isinstance(origin, type):
+        return (origin,)
+    return None
+
+
+def _check_source(name: str, annotation, index: int, namespace: dict):
+    """
+    Get the expression validating one argument, adding the objects it refers
+    to to namespace, or None if the annotation has nothing to check.
+    """
+    allows_none = False
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        members = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(members) == 1:
+            allows_none = True
+            annotation = members[0]
+    constraints = []
+    if typing.get_origin(annotation) is typing.Annotated:
+        annotation, *metadata = typing.get_args(annotation)
+        constraints = [item for item in metadata if isinstance(item, Constraint)]
+
+    parts = []
+    classes = _runtime_types(annotation)
+    if classes is not None:
+        namespace[f"_v_type{index}"] = classes
+        parts.append(f"isinstance({name}, _v_type{index})")
+    for position, constraint in enumerate(constraints):
+        ref = f"_v_value{index}_{position}"
+        namespace[ref] = constraint.value
+        parts.append(constraint.source(name, ref))
+    if not parts:
+        return None
+    check = " and ".join(parts)
+    if allows_none:
+        check = f"{name} is None or ({check})"
+    return check
+
+
+def compile_validator(func: Callable) -> Callable:
+    """
+    Build a wrapper for func that validates its arguments against their
+    annotations and Annotated constraints.
+
+    The annotations are read once, here. The wrapper is generated with the
+    same parameters as func, so each argument already sits in its own local
+    variable when the inlined checks run and no binding happens per call.
+    """
+    signature = inspect.signature(func)
+    hints = typing.get_type_hints(func, include_extras=True)
+    name = func.__name__
+
+    def fail(argument, value):
+        raise ValueError(f"Invalid arguments for {name}: {argument}={value!r} "
+                         f"does not satisfy {hints[argument]!r}")
+
+    namespace = {"_v_func": func, "_v_settings": settings, "_v_fail": fail}
+    parameters, call, checks = [], [], []
+    kind = inspect.Parameter
+    previous_kind = None
+    for index, parameter in enumerate(signature.parameters.values()):
+        if previous_kind is kind.POSITIONAL_ONLY and parameter.kind is not kind.POSITIONAL_ONLY:
+            parameters.append("/")
+        if parameter.kind is kind.KEYWORD_ONLY and previous_kind not in (kind.KEYWORD_ONLY, kind.VAR_POSITIONAL):
+            parameters.append("*")
+        previous_kind = parameter.kind
+
+        text = parameter.name
+        if parameter.default is not parameter.empty:
+            namespace[f"_v_default{index}"] = parameter.default
+            text += f"=_v_default{index}"
+        if parameter.kind in (kind.VAR_POSITIONAL, kind.VAR_KEYWORD):
+            if parameter.kind is kind.VAR_POSITIONAL:
+                parameters.append(f"*{text}")
+                call.append(f"*{parameter.name}")
+                items = parameter.name
+            else:
+                parameters.append(f"**{text}")
+                call.append(f"**{parameter.name}")
+                items = f"{parameter.name}.values()"
+            if parameter.name in hints:
+                # The annotation applies to each value collected by *args or **kwargs
+                check = _check_source("_v_item", hints[parameter.name], index, namespace)
+                if check is not None:
+                    checks.append(f"        for _v_item in {items}:\n"
+                                  f"            if not ({check}): _v_fail({parameter.name!r}, _v_item)")
+            continue
+        parameters.append(text)
+        if parameter.kind is kind.KEYWORD_ONLY:
+            call.append(f"{parameter.name}={parameter.name}")
+        else:
+            call.append(parameter.name)
+        if parameter.name in hints:
+            check = _check_source(parameter.name, hints[parameter.name], index, namespace)
+            if check is not None:
+                if parameter.default is not parameter.empty:
+                    # Defaults are the function author's choice and are not checked
+                    check = f"{parameter.name} is _v_default{index} or ({check})"
+                checks.append(f"        if not ({check}): _v_fail({parameter.name!r}, {parameter.name})")
+    if previous_kind is kind.POSITIONAL_ONLY:
+        parameters.append("/")
+
+    body = "\n".join(checks) or "        pass"
+    source = (
+        f"def _v_wrapper({', '.join(parameters)}):\n"
+        f"    if _v_settings.enabled:\n"
+        f"{body}\n"
+        f"    return _v_func({', '.join(call)})\n"
+    )
+    # A fixed name, since func.__name__ need not be an identifier (a lambda
+    # is "<lambda>"); update_wrapper then copies func's names over
+    exec(compile(source, f"<validator for {func.__qualname__}>", "exec"), namespace)
+    return functools.update_wrapper(namespace["_v_wrapper"], func)